@@ -4,16 +4,20 @@ Handles temporary storage of processing artifacts until final results are saved.
 """
 
 import os
-import json
+import orjson
 import shutil
 import uuid
 from pathlib import Path
 from django.conf import settings
 from typing import Dict, Any, Optional
+from apps.patients.models import clean_folder_name
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Buffer size when copying uploads that can't be moved into the session directory
+_UPLOAD_COPY_BUFFER = 1024 * 1024
+
 
 class ProcessingSession:
     """
@@ -38,10 +42,28 @@ class ProcessingSession:
         
         file_path = os.path.join(self.session_dir, filename)
         
+        # Large uploads are already spooled to a temp file by Django's upload handlers:
+        # move it into the session instead of copying it chunk by chunk
+        temporary_file_path = getattr(image_file, 'temporary_file_path', None)
+        if temporary_file_path is not None:
+            try:
+                os.replace(temporary_file_path(), file_path)
+                # The spooled temp file is created 0600; apply upload permissions like FileSystemStorage._save
+                if settings.FILE_UPLOAD_PERMISSIONS is not None:
+                    os.chmod(file_path, settings.FILE_UPLOAD_PERMISSIONS)
+                logger.info(f"Original image moved to session: {file_path}")
+                return file_path
+            except OSError:
+                # Temp dir on another filesystem (EXDEV): copy file to file, which
+                # shutil does in-kernel (sendfile) on Linux instead of through Python buffers
+                shutil.copyfile(temporary_file_path(), file_path)
+                logger.info(f"Original image copied to session: {file_path}")
+                return file_path
+        
         # Save uploaded file to session directory
+        image_file.seek(0)
         with open(file_path, 'wb') as f:
-            for chunk in image_file.chunks():
-                f.write(chunk)
+            shutil.copyfileobj(image_file, f, _UPLOAD_COPY_BUFFER)
         
         logger.info(f"Original image saved to session: {file_path}")
         return file_path
@@ -56,8 +78,9 @@ class ProcessingSession:
     def save_session_data(self, data: Dict[str, Any], filename: str = 'processing_metadata.json') -> str:
         """Save processing metadata to session"""
         file_path = os.path.join(self.session_dir, filename)
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        # orjson writes NumPy scalars/arrays in C, so metadata needs no conversion pass first
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
         logger.info(f"Session data saved: {file_path}")
         return file_path
     
@@ -65,8 +88,8 @@ class ProcessingSession:
         """Load processing metadata from session"""
         file_path = os.path.join(self.session_dir, filename)
         if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
         return None
     
     def get_file_path(self, filename: str) -> str:
@@ -146,7 +169,7 @@ class ProcessingSession:
         - {scan_id}_preview.png
         """
         # Clean patient name
-        clean_patient_name = "".join(c for c in patient_name if c.isalnum() or c in ['_', '-'])
+        clean_patient_name = clean_folder_name(patient_name)
         
         # Create patient scan directory
         patient_scan_dir = os.path.join(
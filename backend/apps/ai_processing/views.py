@@ -3,7 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.contrib.auth.models import User
-from apps.patients.models import Patient
+from apps.authentication.models import is_admin_user
+from apps.patients.models import Patient, clean_folder_name
 from apps.scans.models import Scan, ScanResult
 from apps.ai_processing.session_manager import SessionManager, ProcessingSession
 import os
@@ -17,30 +18,10 @@ import atexit
 from django.conf import settings
 
 
-def convert_numpy_types(obj):
-    """
-    Recursively convert NumPy types to native Python types for JSON serialization.
-    """
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_numpy_types(item) for item in obj)
-    else:
-        return obj
-
-
 def create_patient_scan_directory(patient_name, scan_number):
     """Create patient-specific directory structure: media/patient_name/scan_number/"""
     # Clean patient name
-    clean_patient_name = "".join(c for c in patient_name if c.isalnum() or c in ['_', '-'])
+    clean_patient_name = clean_folder_name(patient_name)
     
     # Create directory path
     patient_scan_dir = os.path.join(settings.MEDIA_ROOT, clean_patient_name, f"scan_{scan_number}")
@@ -51,7 +32,7 @@ def create_patient_scan_directory(patient_name, scan_number):
 
 class IsAdminOrOwner(permissions.BasePermission):
     def has_permission(self, request, view):
-        if request.user.userprofile.is_admin:
+        if is_admin_user(request.user):
             return True
         return view.action == 'retrieve' or view.action == 'list'
 
@@ -468,13 +449,6 @@ class AIProcessingViewSet(viewsets.ViewSet):
             else:
                 scan_result.volume_estimate = None
             
-            # Convert numpy types for JSON serialization                
-            combined_metadata = convert_numpy_types({
-                'mesh_metadata': stl_results.get('mesh_metadata'),
-                'preview_metadata': preview_results.get('preview_metadata'),
-                'depth_metadata': depth_metadata
-            })
-            
             # Save to JSON field (if it exists) or handle gracefully
             try:
                 # Skip saving to processing_metadata for now due to type checking issues
@@ -500,7 +474,8 @@ class AIProcessingViewSet(viewsets.ViewSet):
             stl_file_size_mb = round(os.path.getsize(stl_dest_path) / (1024 * 1024), 1)
             preview_file_size_mb = round(os.path.getsize(preview_dest_path) / (1024 * 1024), 1)
             
-            response_data = convert_numpy_types({
+            # NumPy values in the metadata are serialized directly by ORJSONRenderer
+            response_data = {
                 'status': 'Mesh generation complete - files saved to patient-centric structure',
                 'patient_directory': f"media/{clean_patient_name}/scan_{scan_number}/",
                 'stl_generation': {
@@ -522,7 +497,7 @@ class AIProcessingViewSet(viewsets.ViewSet):
                 'patient_id': scan.patient.pk,
                 'step': 'mesh_generation',
                 'processor': 'MeshGenerator + MeshPreviewGenerator'
-            })
+            }
             
             # Clean up session files and all temp directories after successful migration
             print(f"🧹 [Backend] Cleaning up session files and temp directories...")
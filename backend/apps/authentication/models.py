@@ -1,9 +1,38 @@
 ﻿from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 
+# Account that anonymous patient/scan creates are assigned to
+DEFAULT_USERNAME = 'default_user'
+_default_user_pk = None
+
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='new_userprofile')
     is_admin = models.BooleanField(default=False)
 
     def __str__(self):
         return self.user.username
+
+
+def is_admin_user(user):
+    """Whether an authenticated user has an admin profile; users without a profile are regular users"""
+    # ProfileTokenAuthentication joins the profile, so this is a cache read for API requests
+    profile = getattr(user, 'new_userprofile', None)
+    return bool(profile and profile.is_admin)
+
+
+def default_user_id():
+    """PK of the default user, looked up once per process; raises User.DoesNotExist if it's missing"""
+    global _default_user_pk
+    if _default_user_pk is None:
+        _default_user_pk = User.objects.values_list('id', flat=True).get(username=DEFAULT_USERNAME)
+    return _default_user_pk
+
+
+@receiver([post_save, post_delete], sender=User)
+def _reset_default_user_id(sender, instance, **kwargs):
+    """Drop the cached default user PK when that account is renamed, recreated or deleted"""
+    global _default_user_pk
+    if instance.pk == _default_user_pk or instance.username == DEFAULT_USERNAME:
+        _default_user_pk = None
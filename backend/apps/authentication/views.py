@@ -4,7 +4,7 @@ from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from django.contrib.auth.models import User
-from .models import UserProfile
+from .models import UserProfile, is_admin_user
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,7 +30,7 @@ class CustomAuthToken(ObtainAuthToken):
                 return Response({'error': 'Invalid credentials'}, status=status.HTTP_400_BAD_REQUEST)
             token, created = Token.objects.get_or_create(user=user)
             
-            is_admin = hasattr(user, 'new_userprofile') and user.new_userprofile.is_admin
+            is_admin = is_admin_user(user)
             logger.info(f"[AuthAPI] ✅ Login successful for user: '{user.username}' (Admin: {is_admin})")
             
             if created:
@@ -114,7 +114,7 @@ def get_user_info(request):
         return Response({'error': 'Authentication required'}, 
                         status=status.HTTP_401_UNAUTHORIZED)
     
-    is_admin = hasattr(user, 'new_userprofile') and user.new_userprofile.is_admin
+    is_admin = is_admin_user(user)
     logger.debug(f"[AuthAPI] ✅ Returning user info for: {user.username} (Admin: {is_admin})")
     
     return Response({
@@ -0,0 +1,11 @@
+# Pagination classes shared across apps
+from rest_framework.pagination import LimitOffsetPagination
+
+
+class StandardLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Caps list responses at `default_limit` rows; clients page with ?limit=&offset=.
+    Responses are wrapped as {count, next, previous, results}.
+    """
+    default_limit = 50
+    max_limit = 200
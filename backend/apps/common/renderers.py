@@ -0,0 +1,119 @@
+# Response renderers shared across apps
+import datetime
+import ipaddress
+import math
+from decimal import Decimal
+
+import numpy as np
+import orjson
+from django.utils.functional import Promise
+from django.utils.http import parse_header_parameters
+from rest_framework.renderers import BaseRenderer
+
+# Datetimes and NumPy values are left to _orjson_default so they render exactly as DRF's
+# JSONEncoder does (orjson's native NumPy path writes float32 with its shorter repr)
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _orjson_default(obj):
+    """
+    Fallback for values orjson doesn't encode itself (datetimes, NumPy, Decimal, lazy strings, ...);
+    mirrors rest_framework.utils.encoders.JSONEncoder.default
+    """
+    if isinstance(obj, datetime.datetime):
+        representation = obj.isoformat()
+        if obj.microsecond:
+            representation = representation[:23] + representation[26:]
+        if representation.endswith('+00:00'):
+            representation = representation[:-6] + 'Z'
+        return representation
+    if isinstance(obj, datetime.date):
+        return obj.isoformat()
+    if isinstance(obj, datetime.time):
+        if obj.utcoffset() is not None:
+            raise ValueError("JSON can't represent timezone-aware times.")
+        representation = obj.isoformat()
+        if obj.microsecond:
+            representation = representation[:12]
+        return representation
+    if isinstance(obj, complex):
+        return [obj.real, obj.imag]
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        # NumPy arrays and scalars
+        return obj.tolist()
+    if hasattr(obj, '__getitem__'):
+        try:
+            return dict(obj)
+        except (TypeError, ValueError):
+            pass
+    if hasattr(obj, '__iter__'):
+        # Sets, querysets and other iterables
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _has_non_finite(obj):
+    """Whether obj holds a NaN or infinite number that JSONRenderer's strict mode would refuse"""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return any(_has_non_finite(item) for item in obj)
+    if isinstance(obj, np.ndarray):
+        return obj.dtype.kind in 'fc' and not np.isfinite(obj).all()
+    if isinstance(obj, (np.floating, np.complexfloating)):
+        return not np.isfinite(obj)
+    if isinstance(obj, Decimal):
+        return not obj.is_finite()
+    if isinstance(obj, complex):
+        return not (math.isfinite(obj.real) and math.isfinite(obj.imag))
+    return False
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson, used for every API response. Encodes serializer output
+    and UUIDs in C; everything else goes through _orjson_default so the bytes match
+    JSONRenderer's, including its refusal of NaN and Infinity.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        """Same lookup as JSONRenderer: media type 'indent' parameter first, then renderer_context"""
+        if accepted_media_type:
+            base_media_type, params = parse_header_parameters(accepted_media_type)
+            try:
+                return max(min(int(params['indent']), 8), 0)
+            except (KeyError, ValueError, TypeError):
+                pass
+        return renderer_context.get('indent', None)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        option = _ORJSON_OPTIONS
+        # orjson only supports two-space indentation; any requested indent enables it
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        content = orjson.dumps(data, default=_orjson_default, option=option)
+        # orjson writes NaN and Infinity as null where JSONRenderer (strict) raises; a
+        # non-finite value can only be present if the output contains a null
+        if b'null' in content and _has_non_finite(data):
+            raise ValueError("Out of range float values are not JSON compliant")
+        # JSONRenderer escapes the two line terminators that are valid JSON but not valid JavaScript
+        if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
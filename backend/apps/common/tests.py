@@ -0,0 +1,85 @@
+import datetime
+from decimal import Decimal
+
+import numpy as np
+import orjson
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONRendererParityTests(SimpleTestCase):
+    """ORJSONRenderer must render API data exactly as DRF's JSONRenderer does."""
+
+    def assertRendersLikeJSONRenderer(self, data, accepted_media_type=None, renderer_context=None):
+        expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+        actual = ORJSONRenderer().render(data, accepted_media_type, renderer_context)
+        self.assertEqual(actual, expected)
+
+    def test_datetimes(self):
+        utc = datetime.timezone.utc
+        singapore = datetime.timezone(datetime.timedelta(hours=8))
+        self.assertRendersLikeJSONRenderer({
+            'aware_utc': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=utc),
+            'aware_utc_micro': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=utc),
+            'aware_offset': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=singapore),
+            'aware_offset_micro': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=singapore),
+            'naive': datetime.datetime(2024, 1, 2, 3, 4, 5),
+            'naive_micro': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456),
+            'date': datetime.date(2024, 1, 2),
+        })
+
+    def test_times(self):
+        self.assertRendersLikeJSONRenderer({
+            'time': datetime.time(3, 4, 5),
+            'time_micro': datetime.time(3, 4, 5, 123456),
+        })
+
+    def test_aware_time_is_refused(self):
+        aware = {'time': datetime.time(3, 4, 5, tzinfo=datetime.timezone.utc)}
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(aware)
+        with self.assertRaises(ValueError):
+            ORJSONRenderer().render(aware)
+
+    def test_decimal_and_lazy_strings(self):
+        self.assertRendersLikeJSONRenderer({
+            'volume': Decimal('12.50'),
+            'label': gettext_lazy('Scan results'),
+        })
+
+    def test_line_separators_are_escaped(self):
+        self.assertRendersLikeJSONRenderer({'details': 'line\u2028break\u2029end'})
+
+    def test_numpy_scalars_and_arrays(self):
+        self.assertRendersLikeJSONRenderer({
+            'float64': np.float64(1.25),
+            'float32': np.float32(0.1),
+            'int64': np.int64(3),
+            'bool': np.bool_(True),
+            'matrix': np.arange(6, dtype=np.int32).reshape(2, 3),
+            'depths': np.array([0.1, 0.5], dtype=np.float32),
+            'strided': np.arange(10.0)[::3],
+        })
+
+    def test_indent(self):
+        data = {'id': 1, 'results': [{'name': 'a'}]}
+        for accepted_media_type, renderer_context in (
+            ('application/json; indent=4', None),
+            ('application/json', {'indent': 2}),
+        ):
+            expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+            actual = ORJSONRenderer().render(data, accepted_media_type, renderer_context)
+            # orjson only indents by two spaces, so compare content and that both are indented
+            self.assertEqual(orjson.loads(actual), orjson.loads(expected))
+            self.assertIn(b'\n  "id"', actual)
+
+    def test_non_finite_floats_are_refused(self):
+        for value in (float('nan'), float('inf'), np.float32('nan'), np.array([1.0, np.inf]), Decimal('NaN')):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render({'volume': value})
+                with self.assertRaises(ValueError):
+                    ORJSONRenderer().render({'volume': value})
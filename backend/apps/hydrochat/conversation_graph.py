@@ -654,7 +654,7 @@ How would you like to proceed?"""
 
     def execute_update_patient_node(self, state: GraphState) -> GraphState:
         """
-        Node 8: Execute patient update via tool layer with PUT merge logic.
+        Node 8: Execute patient update via tool layer (PATCH, with GET + PUT fallback).
         """
         conv_state = state["conversation_state"]
         patient_id = conv_state.validated_fields['patient_id']
@@ -662,7 +662,7 @@ How would you like to proceed?"""
         logger.info(f"[{LogCategory.TOOL}] 🔧 Executing patient update for ID: {patient_id}")
         
         try:
-            # Execute patient update tool (includes GET + merge + PUT logic)
+            # Execute patient update tool (PATCH of changed fields only)
             update_fields = {k: v for k, v in conv_state.validated_fields.items() 
                            if k != 'patient_id' and v is not None}
             
@@ -941,8 +941,7 @@ Please provide the corrected information."""
             tool_result = self.tool_manager.execute_tool(
                 Intent.GET_SCAN_RESULTS,
                 conv_state.metrics,
-                patient_id=patient_id,
-                limit=conv_state.scan_display_limit
+                patient_id=patient_id
             )
             
             if tool_result.success and tool_result.data is not None:
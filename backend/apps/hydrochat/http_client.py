@@ -4,6 +4,7 @@ import time
 from typing import Any, Dict, Optional
 import requests
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
 from .config import load_config
 from .utils import mask_nric
 
@@ -19,15 +20,27 @@ metrics: Dict[str, int] = {
 
 _RETRY_STATUS = {502, 503, 504}
 _BACKOFF_S = [0.5, 1.0]  # two retries max
+# Keep-alive pool sizing for the shared session (all tool calls hit the same backend host)
+_POOL_CONNECTIONS = 10
+_POOL_MAXSIZE = 50
 
 class HttpError(Exception):
     def __init__(self, response: Response):
         self.response = response
         super().__init__(f"HTTP {response.status_code}: {response.text[:200]}")
 
+def _build_session() -> Session:
+    """Create a requests Session with a pooled adapter so connections are reused across calls."""
+    session = requests.Session()
+    # Retries stay in HttpClient.request (status + backoff aware), so the adapter does not retry
+    adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 class HttpClient:
     def __init__(self, session: Optional[Session] = None):
-        self.session = session or requests.Session()
+        self.session = session or _build_session()
         self.config = load_config()
 
     def _build_url(self, path: str) -> str:
@@ -1,8 +1,12 @@
 # Phase 10: Structured Logging & Metrics for HydroChat
 
+import atexit
 import json
 import logging
+import logging.handlers
+import queue
 import re
+import threading
 from datetime import datetime
 from typing import Any, Dict, Optional, Union
 
@@ -113,6 +117,19 @@ class HydroChatFormatter(logging.Formatter):
             return "🐛 "
 
 
+class _ParentDispatchHandler(logging.Handler):
+    """Hand queued records to the handlers the source logger would propagate to."""
+    
+    def __init__(self, source: logging.Logger):
+        super().__init__()
+        self._source = source
+        
+    def emit(self, record: logging.LogRecord) -> None:
+        parent = self._source.parent
+        if parent is not None:
+            parent.handle(record)
+
+
 class MetricsLogger:
     """
     Centralized metrics tracking and reporting for HydroChat operations.
@@ -121,6 +138,27 @@ class MetricsLogger:
     
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.metrics")
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._listener_lock = threading.Lock()
+        
+    def start_queue_listener(self) -> None:
+        """
+        Move metrics handler I/O off the calling thread.
+        
+        Records are handed to a QueueHandler and re-dispatched to the parent
+        logger's handlers by a QueueListener thread, which is flushed and
+        stopped at interpreter exit. Safe to call more than once.
+        """
+        with self._listener_lock:
+            if self._listener is not None:
+                return
+            records: queue.SimpleQueue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(records, _ParentDispatchHandler(self.logger))
+            listener.start()
+            atexit.register(listener.stop)
+            self.logger.addHandler(logging.handlers.QueueHandler(records))
+            self.logger.propagate = False
+            self._listener = listener
         
     def log_tool_call_start(self, tool_name: str, state_metrics: Dict[str, int]) -> None:
         """Log the start of a tool call with current metrics."""
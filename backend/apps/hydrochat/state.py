@@ -113,6 +113,25 @@ class ConversationState:
             'config_snapshot': self.config_snapshot.copy()
         }
     
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> 'ConversationState':
+        """Rebuild a state from serialize_snapshot() output (enums restored by name).
+        
+        Bypasses __init__ and fills __dict__ in one update: the snapshot already
+        carries every required key, so building defaults first is wasted work.
+        """
+        state = cls.__new__(cls)
+        fields = dict(data)
+        fields['recent_messages'] = deque(data['recent_messages'], maxlen=5)
+        fields['intent'] = Intent[data['intent']]
+        fields['pending_action'] = PendingAction[data['pending_action']]
+        fields['pending_fields'] = set(data['pending_fields'])
+        fields['patient_cache_timestamp'] = datetime.fromisoformat(data['patient_cache_timestamp'])
+        fields['awaiting_confirmation_type'] = ConfirmationType[data['awaiting_confirmation_type']]
+        fields['download_stage'] = DownloadStage[data['download_stage']]
+        state.__dict__.update(fields)
+        return state
+    
     def reset_for_cancellation(self) -> None:
         """Reset state when user cancels current action."""
         self.pending_action = PendingAction.NONE
@@ -4,6 +4,7 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from collections import deque
+import orjson
 
 from apps.hydrochat.conversation_graph import ConversationGraph, ConversationGraphNodes, GraphState  
 from apps.hydrochat.state import ConversationState
@@ -250,11 +251,11 @@ class TestPhase8ErrorHandling:
         
         # Mock HTTP response with multiple validation errors
         mock_response = MagicMock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "nric": ["This field is required.", "Invalid format."],
             "first_name": ["Ensure this field has at most 50 characters."],
             "contact_no": ["Invalid contact number format"]
-        }
+        })
         
         tools = PatientTools(MagicMock())
         result = tools._parse_400_validation_error(mock_response)
@@ -275,7 +276,7 @@ class TestPhase8ErrorHandling:
         
         # Mock HTTP response with malformed JSON
         mock_response = MagicMock()
-        mock_response.json.side_effect = Exception("Invalid JSON")
+        mock_response.content = b'<html>Bad Request</html>'
         
         tools = PatientTools(MagicMock())
         result = tools._parse_400_validation_error(mock_response)
@@ -11,6 +11,7 @@ Tests for:
 import pytest
 from unittest.mock import Mock, patch
 from collections import deque
+import orjson
 
 from apps.hydrochat.conversation_graph import ConversationGraph
 from apps.hydrochat.state import ConversationState
@@ -144,6 +145,44 @@ class TestPaginationHandling:
         result2 = conversation_graph.nodes.show_more_scans_node(state)
         assert "All 15 scan results have been displayed" in result2["agent_response"]
 
+    def test_scan_results_spanning_api_pages(self, conversation_graph, mock_http_client):
+        """Test results beyond the first API page reach the buffer and 'show more'."""
+        def page(rows, next_url):
+            response = Mock()
+            response.status_code = 200
+            response.content = orjson.dumps({
+                'count': 60,
+                'next': next_url,
+                'previous': None,
+                'results': [
+                    {'id': i + 1, 'scan_id': f'SCAN_{i+1:03d}', 'scan_date': '2024-01-01'}
+                    for i in rows
+                ],
+            })
+            return response
+        
+        next_url = 'http://testserver/api/scan-results/?limit=50&offset=50&patient=5'
+        mock_http_client.request.side_effect = [page(range(50), next_url), page(range(50, 60), None)]
+        conv_state = ConversationState()
+        state = {
+            "user_message": "show scans for patient 5",
+            "conversation_state": conv_state,
+            "extracted_fields": {"patient_id": 5},
+        }
+        
+        result = conversation_graph.nodes.get_scan_results_node(state)
+        
+        # The whole result set is buffered, not just the display limit or the first page
+        assert "(60 result(s))" in result["agent_response"]
+        assert len(conv_state.scan_results_buffer) == 60
+        assert mock_http_client.request.call_args_list[0].kwargs == {'params': {'patient': 5}}
+        
+        more_state = {"user_message": "show more scans", "conversation_state": conv_state}
+        for _ in range(5):
+            result = conversation_graph.nodes.show_more_scans_node(more_state)
+        assert "showing 51-60 of 60" in result["agent_response"]
+        assert "**60. Scan SCAN_060**" in result["agent_response"]
+
 
 class TestDepthMapHandling:
     """Test depth map functionality."""
@@ -1,5 +1,5 @@
 from apps.hydrochat.enums import Intent, PendingAction, ConfirmationType, DownloadStage
-from apps.hydrochat.utils import validate_nric, mask_nric
+from apps.hydrochat.utils import validate_nric, mask_nric, NRIC_REGEX
 from apps.hydrochat.config import load_config
 
 
@@ -18,6 +18,9 @@ def test_nric_masking():
 def test_nric_validation():
     assert validate_nric('S1234567A') is True
     assert validate_nric('1234567A') is False
+    # Only ASCII digits, matching NRIC_REGEX (str.isdigit alone accepts superscripts)
+    assert validate_nric('S\u00b2234567A') is False
+    assert NRIC_REGEX.match('S\u00b2234567A') is None
 
 
 def test_config_snapshot_redaction(monkeypatch):
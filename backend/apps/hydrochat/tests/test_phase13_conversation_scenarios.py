@@ -3,6 +3,7 @@
 
 import pytest
 from unittest.mock import MagicMock
+import orjson
 
 from apps.hydrochat.conversation_graph import create_conversation_graph, process_conversation_turn
 from apps.hydrochat.state import ConversationState  
@@ -21,12 +22,12 @@ class TestFullConversationScenarios:
         # Mock the raw HTTP response, not ToolResponse
         mock_response = MagicMock()
         mock_response.status_code = 201
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             'id': 123,
             'first_name': 'John',
             'last_name': 'Doe', 
             'nric': 'S1234567A'
-        }
+        })
         mock_http_client.request.return_value = mock_response
         
         graph = create_conversation_graph(mock_http_client)
@@ -51,10 +52,10 @@ class TestFullConversationScenarios:
         # Mock the raw HTTP response, not ToolResponse
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [
+        mock_response.content = orjson.dumps([
             {'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'},
             {'id': 2, 'first_name': 'Jane', 'last_name': 'Smith', 'nric': 'T9876543B'}
-        ]
+        ])
         mock_http_client.request.return_value = mock_response
         
         graph = create_conversation_graph(mock_http_client)
@@ -83,7 +84,7 @@ class TestPerformanceBenchmarks:
         # Mock the raw HTTP response, not ToolResponse
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {'id': 123, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}
+        mock_response.content = orjson.dumps({'id': 123, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'})
         mock_http_client.request.return_value = mock_response
         
         graph = create_conversation_graph(mock_http_client)
@@ -15,6 +15,7 @@ Official docs:
 
 import pytest
 import os
+import threading
 from unittest.mock import Mock, patch, MagicMock
 import redis
 
@@ -54,16 +55,31 @@ class TestRedisConfiguration:
             'REDIS_DB': '5',
             'REDIS_PASSWORD': 'testpass',
             'REDIS_MAX_CONNECTIONS': '100',
-            'REDIS_SOCKET_TIMEOUT': '10'
+            'REDIS_SOCKET_TIMEOUT': '10',
+            'REDIS_POOL_TIMEOUT': '30'
         }):
             config = RedisConfig.get_config_from_env()
             
-            assert config['host'] == 'testhost'
-            assert config['port'] == 9999
-            assert config['db'] == 5
-            assert config['password'] == 'testpass'
-            assert config['max_connections'] == 100
-            assert config['socket_timeout'] == 10
+            assert config.host == 'testhost'
+            assert config.port == 9999
+            assert config.db == 5
+            assert config.password == 'testpass'
+            assert config.max_connections == 100
+            assert config.socket_timeout == 10
+            assert config.pool_timeout == 30
+    
+    def test_get_config_parses_env_once(self):
+        """Test configuration is cached after the first call until close()."""
+        RedisConfig._config = None
+        with patch.dict(os.environ, {'REDIS_HOST': 'firsthost'}):
+            config = RedisConfig.get_config()
+        with patch.dict(os.environ, {'REDIS_HOST': 'secondhost'}):
+            assert RedisConfig.get_config() is config
+            assert RedisConfig.get_config().host == 'firsthost'
+            
+            RedisConfig.close()
+            assert RedisConfig.get_config().host == 'secondhost'
+        RedisConfig._config = None
     
     def test_get_connection_string_without_password(self):
         """Test Redis connection string generation without password."""
@@ -73,6 +89,8 @@ class TestRedisConfiguration:
             'REDIS_DB': '0',
             'REDIS_PASSWORD': ''
         }):
+            RedisConfig._config = None
+            RedisConfig._conn_str = None
             conn_str = RedisConfig.get_connection_string()
             assert conn_str == "redis://localhost:6379/0"
     
@@ -84,6 +102,8 @@ class TestRedisConfiguration:
             'REDIS_DB': '0',
             'REDIS_PASSWORD': 'secret'
         }):
+            RedisConfig._config = None
+            RedisConfig._conn_str = None
             conn_str = RedisConfig.get_connection_string()
             assert conn_str == "redis://:secret@localhost:6379/0"
     
@@ -139,6 +159,28 @@ class TestRedisConfiguration:
             
             result = RedisConfig.health_check()
             assert result is False
+    
+    @patch('config.redis_config.redis.Redis')
+    def test_health_check_reuses_recent_ping(self, mock_redis_class):
+        """Test back-to-back health checks share one PING, but failures aren't cached."""
+        mock_client = Mock()
+        mock_client.ping.return_value = True
+        mock_redis_class.return_value = mock_client
+        
+        with patch.dict(os.environ, {'USE_REDIS_STATE': 'true'}):
+            RedisConfig._client = None
+            RedisConfig._pool = None
+            
+            assert RedisConfig.health_check() is True
+            assert RedisConfig.health_check() is True
+            assert mock_client.ping.call_count == 1
+            
+            # Once the cached result expires, a failed PING is re-checked on every call
+            RedisConfig._last_ping_ts = None
+            mock_client.ping.side_effect = redis.ConnectionError("Connection refused")
+            assert RedisConfig.health_check() is False
+            assert RedisConfig.health_check() is False
+            assert mock_client.ping.call_count == 3
 
 
 class TestConversationGraphCheckpointer:
@@ -265,12 +307,122 @@ class TestPhase18ExitCriteria:
             # Should be same instance (singleton pattern)
             assert client1 is client2
     
+    @patch('config.redis_config.BlockingConnectionPool')
+    def test_ec_concurrent_pool_init_creates_one_pool(self, mock_pool_class):
+        """EC: Concurrent first calls share a single connection pool."""
+        RedisConfig._client = None
+        RedisConfig._pool = None
+        start = threading.Barrier(8)
+        pools = []
+        
+        def get_pool():
+            start.wait()
+            pools.append(RedisConfig.get_connection_pool())
+        
+        threads = [threading.Thread(target=get_pool) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert mock_pool_class.call_count == 1
+        assert all(pool is pools[0] for pool in pools)
+        RedisConfig._pool = None
+    
     def test_ec_optional_redis_enabled_by_default_false(self):
         """EC: Redis is optional and disabled by default."""
         with patch.dict(os.environ, {'USE_REDIS_STATE': 'false'}):
             assert RedisConfig.is_enabled() is False
 
 
+class TestRedisConversationStateStore:
+    """Test the Redis-backed conversation state store."""
+    
+    def test_put_writes_hash_with_ttl(self):
+        """Test state is written as a per-field hash with a server-side TTL."""
+        from apps.hydrochat.views import RedisConversationStateStore
+        from apps.hydrochat.state import ConversationState
+        
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        store = RedisConversationStateStore(client, ttl_minutes=30)
+        store.put('abc12345', ConversationState())
+        
+        mapping = pipe.hset.call_args.kwargs['mapping']
+        assert pipe.hset.call_args.args == ('hc:conv:abc12345',)
+        assert set(mapping) == set(ConversationState().serialize_snapshot())
+        pipe.expire.assert_called_once_with('hc:conv:abc12345', 1800)
+        pipe.execute.assert_called_once()
+    
+    def test_get_round_trips_state_and_refreshes_ttl(self):
+        """Test stored state is restored and its TTL slides on access."""
+        from apps.hydrochat.views import RedisConversationStateStore
+        from apps.hydrochat.state import ConversationState
+        from apps.hydrochat.enums import Intent
+        
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        store = RedisConversationStateStore(client, ttl_minutes=30)
+        state = ConversationState()
+        state.intent = Intent.LIST_PATIENTS
+        store.put('abc12345', state)
+        stored = {name: value.decode() for name, value in pipe.hset.call_args.kwargs['mapping'].items()}
+        pipe.reset_mock()
+        pipe.execute.return_value = [stored, True]
+        
+        restored = store.get('abc12345')
+        
+        pipe.hgetall.assert_called_once_with('hc:conv:abc12345')
+        pipe.expire.assert_called_once_with('hc:conv:abc12345', 1800)
+        assert restored is not None
+        assert restored.intent == Intent.LIST_PATIENTS
+    
+    def test_get_missing_conversation(self):
+        """Test missing or expired keys return None."""
+        from apps.hydrochat.views import RedisConversationStateStore
+        
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [{}, False]
+        store = RedisConversationStateStore(client)
+        
+        assert store.get('missing0') is None
+    
+    def test_get_returns_none_when_redis_unavailable(self):
+        """Test a Redis error on read starts a fresh conversation instead of failing the request."""
+        from apps.hydrochat.views import RedisConversationStateStore
+        
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        store = RedisConversationStateStore(client)
+        
+        assert store.get('abc12345') is None
+    
+    def test_put_skips_when_redis_unavailable(self):
+        """Test a Redis error on write is logged rather than raised."""
+        from apps.hydrochat.views import RedisConversationStateStore
+        from apps.hydrochat.state import ConversationState
+        
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = redis.TimeoutError("slow")
+        store = RedisConversationStateStore(client)
+        
+        store.put('abc12345', ConversationState())
+    
+    @patch('config.redis_config.RedisConfig.health_check')
+    def test_store_chosen_from_configuration_only(self, mock_health_check):
+        """Test the backend follows USE_REDIS_STATE without pinging Redis at startup."""
+        from apps.hydrochat.views import (
+            ConversationStateStore, RedisConversationStateStore, create_conversation_store
+        )
+        
+        with patch.dict(os.environ, {'USE_REDIS_STATE': 'true'}):
+            assert isinstance(create_conversation_store(), RedisConversationStateStore)
+        RedisConfig.close()
+        with patch.dict(os.environ, {'USE_REDIS_STATE': 'false'}):
+            assert isinstance(create_conversation_store(), ConversationStateStore)
+        mock_health_check.assert_not_called()
+
+
 class TestRedisCleanup:
     """Test Redis connection cleanup."""
     
@@ -310,6 +462,7 @@ class TestRedisDocumentationCompliance:
             # Reset to test fresh pool creation
             RedisConfig._pool = None
             RedisConfig._client = None
+            RedisConfig._config = None
             
             pool = RedisConfig.get_connection_pool()
             
@@ -326,6 +479,8 @@ class TestRedisDocumentationCompliance:
             'REDIS_PORT': '6379',
             'REDIS_DB': '0'
         }):
+            RedisConfig._config = None
+            RedisConfig._conn_str = None
             conn_str = RedisConfig.get_connection_string()
             
             # Should follow redis:// format
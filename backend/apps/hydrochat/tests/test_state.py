@@ -94,3 +94,25 @@ def test_message_rolling_window():
     messages = list(state.recent_messages)
     assert messages[0]['content'] == 'message 2'  # oldest kept
     assert messages[-1]['content'] == 'message 6'  # newest
+
+
+def test_snapshot_round_trip():
+    """Test from_snapshot restores a state from its JSON snapshot."""
+    state = ConversationState()
+    state.intent = Intent.UPDATE_PATIENT
+    state.pending_action = PendingAction.UPDATE_PATIENT
+    state.download_stage = DownloadStage.PREVIEW_SHOWN
+    state.pending_fields = {'nric'}
+    state.selected_patient_id = 7
+    state.add_message('user', 'update patient 7')
+    
+    restored = ConversationState.from_snapshot(json.loads(json.dumps(state.serialize_snapshot())))
+    
+    assert restored.intent == Intent.UPDATE_PATIENT
+    assert restored.pending_action == PendingAction.UPDATE_PATIENT
+    assert restored.download_stage == DownloadStage.PREVIEW_SHOWN
+    assert restored.pending_fields == {'nric'}
+    assert restored.selected_patient_id == 7
+    assert restored.recent_messages.maxlen == 5
+    assert list(restored.recent_messages) == list(state.recent_messages)
+    assert restored.patient_cache_timestamp == state.patient_cache_timestamp
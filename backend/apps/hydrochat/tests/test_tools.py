@@ -2,15 +2,32 @@
 # Tests all patient and scan tools with validation, error handling, and NRIC masking
 
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, call, patch
+import orjson
 from pydantic import ValidationError
 import pytest
 
 from apps.hydrochat.enums import Intent
-from apps.hydrochat.http_client import HttpClient
+from apps.hydrochat.http_client import HttpClient, HttpError
 from apps.hydrochat.tools import PatientTools, ScanTools, ToolManager, PatientInput, ToolResponse
 
 
+# Known-valid required fields shared by the single-field validation tests
+_BASE_PATIENT = {'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}
+
+
+def make_patient(**overrides) -> PatientInput:
+    """Validate the shared base patient with the given field overrides applied."""
+    return PatientInput.model_validate({**_BASE_PATIENT, **overrides})
+
+
+class FakeHttpClient:
+    """Lightweight HttpClient stand-in; only the `request` boundary is mocked."""
+
+    def __init__(self):
+        self.request = Mock()
+
+
 class TestPatientInput:
     """Test Pydantic validation model for patient inputs."""
     
@@ -46,61 +63,61 @@ class TestPatientInput:
 
     def test_nric_validation(self):
         """Test NRIC field validation."""
-        base_data = {'first_name': 'John', 'last_name': 'Doe'}
-        
         # Valid NRIC
-        patient = PatientInput(**base_data, nric='S1234567A')
+        patient = make_patient(nric='S1234567A')
         assert patient.nric == 'S1234567A'
         
         # Empty NRIC should raise ValidationError
         with pytest.raises(ValidationError):  # Just check that ValidationError is raised
-            PatientInput(**base_data, nric='')
+            make_patient(nric='')
         
         # Long NRIC should raise ValidationError (using Pydantic's built-in validation)
         with pytest.raises(ValidationError):
-            PatientInput(**base_data, nric='S1234567890')
+            make_patient(nric='S1234567890')
         
         # NRIC should be uppercase and stripped
-        patient = PatientInput(**base_data, nric=' s1234567a ')
+        patient = make_patient(nric=' s1234567a ')
         assert patient.nric == 'S1234567A'
 
     def test_date_of_birth_validation(self):
         """Test date of birth field validation."""
-        base_data = {'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}
-        
         # Valid date
-        patient = PatientInput(**base_data, date_of_birth='1990-01-01')
+        patient = make_patient(date_of_birth='1990-01-01')
         assert patient.date_of_birth == '1990-01-01'
         
         # None is valid
-        patient = PatientInput(**base_data, date_of_birth=None)
+        patient = make_patient(date_of_birth=None)
         assert patient.date_of_birth is None
         
         # Invalid date format should raise ValidationError
         with pytest.raises(ValidationError, match="Date of birth must be in YYYY-MM-DD format"):
-            PatientInput(**base_data, date_of_birth='01/01/1990')
+            make_patient(date_of_birth='01/01/1990')
+
+        with pytest.raises(ValidationError, match="Date of birth must be in YYYY-MM-DD format"):
+            make_patient(date_of_birth='1990-02-30')
+        
+        with pytest.raises(ValidationError, match="Date of birth must be in YYYY-MM-DD format"):
+            make_patient(date_of_birth='19900101')
 
     def test_contact_no_validation(self):
         """Test contact number field validation."""
-        base_data = {'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}
-        
         # Valid contact numbers
         valid_contacts = ['+6512345678', '12345678', '+65 1234 5678', '+65-1234-5678']
         for contact in valid_contacts:
-            patient = PatientInput(**base_data, contact_no=contact)
+            patient = make_patient(contact_no=contact)
             assert patient.contact_no == contact
         
         # None is valid
-        patient = PatientInput(**base_data, contact_no=None)
+        patient = make_patient(contact_no=None)
         assert patient.contact_no is None
         
         # Empty string should become None
-        patient = PatientInput(**base_data, contact_no='')
+        patient = make_patient(contact_no='')
         assert patient.contact_no is None
         
         # Invalid contact with letters should raise ValidationError
         with pytest.raises(ValidationError, match="Contact number must contain only digits"):
-            PatientInput(**base_data, contact_no='123abc456')
+            make_patient(contact_no='123abc456')
 
 
 class TestPatientTools:
@@ -121,7 +138,7 @@ class TestPatientTools:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 201
-        mock_response.json.return_value = {'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}
+        mock_response.content = orjson.dumps({'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'})
         mock_http_client.request.return_value = mock_response
         
         # Call tool
@@ -166,7 +183,7 @@ class TestPatientTools:
         # Mock API error response
         mock_response = MagicMock()
         mock_response.status_code = 400
-        mock_response.json.return_value = {"nric": ["Invalid NRIC format"]}  # Proper validation error format
+        mock_response.content = orjson.dumps({"nric": ["Invalid NRIC format"]})  # Proper validation error format
         mock_http_client.request.return_value = mock_response
         
         # Call tool
@@ -185,10 +202,10 @@ class TestPatientTools:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [
+        mock_response.content = orjson.dumps([
             {'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'},
             {'id': 2, 'first_name': 'Jane', 'last_name': 'Smith', 'nric': 'S2345678B'}
-        ]
+        ])
         mock_http_client.request.return_value = mock_response
         
         # Call tool
@@ -207,7 +224,7 @@ class TestPatientTools:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}]
+        mock_response.content = orjson.dumps([{'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}])
         mock_http_client.request.return_value = mock_response
         
         # Call tool with limit
@@ -225,7 +242,7 @@ class TestPatientTools:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}
+        mock_response.content = orjson.dumps({'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'})
         mock_http_client.request.return_value = mock_response
         
         # Call tool
@@ -239,6 +256,24 @@ class TestPatientTools:
         # Verify HTTP call
         mock_http_client.request.assert_called_once_with('GET', '/api/patients/1/')
 
+    def test_tool_get_patient_cached(self, patient_tools, mock_http_client):
+        """Test repeated retrieval within the TTL is served from cache until the patient changes."""
+        get_response = MagicMock()
+        get_response.status_code = 200
+        get_response.content = orjson.dumps({'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'})
+        mock_http_client.request.return_value = get_response
+        
+        first = patient_tools.tool_get_patient(patient_id=1)
+        second = patient_tools.tool_get_patient(patient_id=1)
+        
+        assert first.data == second.data
+        assert mock_http_client.request.call_count == 1
+        
+        # Update invalidates the cached entry
+        patient_tools.tool_update_patient(patient_id=1, last_name='Smith')
+        patient_tools.tool_get_patient(patient_id=1)
+        assert mock_http_client.request.call_count == 3
+
     def test_tool_get_patient_not_found(self, patient_tools, mock_http_client):
         """Test patient retrieval when patient not found."""
         # Mock 404 response
@@ -254,31 +289,73 @@ class TestPatientTools:
         assert 'Patient with ID 999 not found' in result.error
 
     def test_tool_update_patient_success(self, patient_tools, mock_http_client):
-        """Test successful patient update."""
+        """Test successful patient update sends only the changed fields via PATCH."""
+        # Mock update response
+        update_response = MagicMock()
+        update_response.status_code = 200
+        update_response.content = orjson.dumps({
+            'id': 1,
+            'first_name': 'John',
+            'last_name': 'Smith',  # Updated
+            'nric': 'S1234567A',
+            'date_of_birth': '1990-01-01'
+        })
+        mock_http_client.request.return_value = update_response
+        
+        # Call tool
+        result = patient_tools.tool_update_patient(patient_id=1, last_name='Smith')
+        
+        # Verify result
+        assert result.success is True
+        assert result.data['last_name'] == 'Smith'
+        assert result.nric_masked is True
+        
+        # Verify single PATCH call, no pre-fetch
+        mock_http_client.request.assert_called_once_with(
+            'PATCH',
+            '/api/patients/1/',
+            json={'last_name': 'Smith'}
+        )
+
+    def test_tool_update_patient_validation_error(self, patient_tools, mock_http_client):
+        """Test that supplied update fields are validated before any HTTP call."""
+        result = patient_tools.tool_update_patient(patient_id=1, date_of_birth='01/01/1990')
+        
+        assert result.success is False
+        assert 'Validation error' in result.error
+        mock_http_client.request.assert_not_called()
+
+    def test_tool_update_patient_falls_back_to_put(self, patient_tools, mock_http_client):
+        """Test GET + merge + PUT fallback when the backend rejects PATCH."""
+        # Mock 405 for PATCH (HttpClient raises on non-2xx)
+        not_allowed = MagicMock()
+        not_allowed.status_code = 405
+        not_allowed.text = 'Method Not Allowed'
+        
         # Mock get patient response (for current data)
         get_response = MagicMock()
         get_response.status_code = 200
-        get_response.json.return_value = {
+        get_response.content = orjson.dumps({
             'id': 1,
             'first_name': 'John',
             'last_name': 'Doe',
             'nric': 'S1234567A',
             'date_of_birth': '1990-01-01'
-        }
+        })
         
         # Mock update response
         update_response = MagicMock()
         update_response.status_code = 200
-        update_response.json.return_value = {
+        update_response.content = orjson.dumps({
             'id': 1,
             'first_name': 'John',
             'last_name': 'Smith',  # Updated
             'nric': 'S1234567A',
             'date_of_birth': '1990-01-01'
-        }
+        })
         
-        # Mock HTTP client to return different responses for GET and PUT
-        mock_http_client.request.side_effect = [get_response, update_response]
+        # Mock HTTP client to reject PATCH, then return responses for GET and PUT
+        mock_http_client.request.side_effect = (HttpError(not_allowed), get_response, update_response)
         
         # Call tool
         result = patient_tools.tool_update_patient(patient_id=1, last_name='Smith')
@@ -286,10 +363,9 @@ class TestPatientTools:
         # Verify result
         assert result.success is True
         assert result.data['last_name'] == 'Smith'
-        assert result.nric_masked is True
         
         # Verify HTTP calls
-        assert mock_http_client.request.call_count == 2
+        assert mock_http_client.request.call_count == 3
         mock_http_client.request.assert_any_call('GET', '/api/patients/1/')
         mock_http_client.request.assert_any_call(
             'PUT',
@@ -302,37 +378,53 @@ class TestPatientTools:
             }
         )
 
-    def test_tool_delete_patient_success(self, patient_tools, mock_http_client):
-        """Test successful patient deletion."""
-        # Mock get patient response (for logging)
-        get_response = MagicMock()
-        get_response.status_code = 200
-        get_response.json.return_value = {
-            'id': 1,
-            'first_name': 'John',
-            'last_name': 'Doe',
-            'nric': 'S1234567A'
-        }
+    def test_tool_update_patient_put_fallback_bypasses_cache(self, patient_tools, mock_http_client):
+        """Test the GET + PUT fallback re-reads the patient instead of merging into a cached copy."""
+        stale_response = MagicMock()
+        stale_response.status_code = 200
+        stale_response.content = orjson.dumps({'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'})
+        mock_http_client.request.return_value = stale_response
+        patient_tools.tool_get_patient(patient_id=1)
+        
+        not_allowed = MagicMock()
+        not_allowed.status_code = 405
+        not_allowed.text = 'Method Not Allowed'
+        fresh_response = MagicMock()
+        fresh_response.status_code = 200
+        fresh_response.content = orjson.dumps({
+            'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A', 'details': 'Edited elsewhere'
+        })
+        update_response = MagicMock()
+        update_response.status_code = 200
+        update_response.content = orjson.dumps({'id': 1, 'first_name': 'Jonathan'})
+        mock_http_client.request.side_effect = (HttpError(not_allowed), fresh_response, update_response)
+        
+        result = patient_tools.tool_update_patient(patient_id=1, first_name='Jonathan')
         
+        assert result.success is True
+        mock_http_client.request.assert_any_call(
+            'PUT',
+            '/api/patients/1/',
+            json={'first_name': 'Jonathan', 'last_name': 'Doe', 'nric': 'S1234567A', 'details': 'Edited elsewhere'}
+        )
+
+    def test_tool_delete_patient_success(self, patient_tools, mock_http_client):
+        """Test successful patient deletion issues a single DELETE."""
         # Mock delete response
         delete_response = MagicMock()
         delete_response.status_code = 204
-        
-        # Mock HTTP client responses
-        mock_http_client.request.side_effect = [get_response, delete_response]
+        mock_http_client.request.return_value = delete_response
         
         # Call tool
         result = patient_tools.tool_delete_patient(patient_id=1)
         
         # Verify result
         assert result.success is True
-        assert 'John Doe deleted successfully' in result.data['message']
+        assert 'Patient ID 1 deleted successfully' in result.data['message']
         assert result.nric_masked is True
         
-        # Verify HTTP calls
-        assert mock_http_client.request.call_count == 2
-        mock_http_client.request.assert_any_call('GET', '/api/patients/1/')
-        mock_http_client.request.assert_any_call('DELETE', '/api/patients/1/')
+        # Verify HTTP call (no GET pre-fetch)
+        mock_http_client.request.assert_called_once_with('DELETE', '/api/patients/1/')
 
 
 class TestScanTools:
@@ -353,10 +445,10 @@ class TestScanTools:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [
+        mock_response.content = orjson.dumps([
             {'id': 1, 'patient': 1, 'scan_type': 'wound'},
             {'id': 2, 'patient': 1, 'scan_type': 'wound'}
-        ]
+        ])
         mock_http_client.request.return_value = mock_response
         
         # Call tool
@@ -374,7 +466,7 @@ class TestScanTools:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{'id': 1, 'patient': 1, 'scan_type': 'wound'}]
+        mock_response.content = orjson.dumps([{'id': 1, 'patient': 1, 'scan_type': 'wound'}])
         mock_http_client.request.return_value = mock_response
         
         # Call tool with patient filter
@@ -388,11 +480,11 @@ class TestScanTools:
         mock_http_client.request.assert_called_once_with('GET', '/api/scan-results/', params={'patient': 1})
 
     def test_tool_list_scan_results_with_limit(self, scan_tools, mock_http_client):
-        """Test scan results listing with limit parameter."""
+        """Test limit caps the rows returned instead of being sent as the page size."""
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{'id': 1, 'patient': 1, 'scan_type': 'wound'}]
+        mock_response.content = orjson.dumps([{'id': i, 'patient': 1, 'scan_type': 'wound'} for i in range(8)])
         mock_http_client.request.return_value = mock_response
         
         # Call tool with limit
@@ -400,22 +492,72 @@ class TestScanTools:
         
         # Verify result
         assert result.success is True
+        assert len(result.data) == 5
         
         # Verify HTTP call with params
         mock_http_client.request.assert_called_once_with(
             'GET', 
             '/api/scan-results/', 
-            params={'patient': 1, 'limit': 5}
+            params={'patient': 1}
         )
 
+    def test_tool_list_scan_results_follows_next_pages(self, scan_tools, mock_http_client):
+        """Test every page of a paginated response is fetched by following next."""
+        next_url = 'http://testserver/api/scan-results/?limit=50&offset=50&patient=1'
+        first_page = MagicMock()
+        first_page.status_code = 200
+        first_page.content = orjson.dumps({
+            'count': 60,
+            'next': next_url,
+            'previous': None,
+            'results': [{'id': i, 'patient': 1} for i in range(50)],
+        })
+        second_page = MagicMock()
+        second_page.status_code = 200
+        second_page.content = orjson.dumps({
+            'count': 60,
+            'next': None,
+            'previous': 'http://testserver/api/scan-results/?limit=50&patient=1',
+            'results': [{'id': i, 'patient': 1} for i in range(50, 60)],
+        })
+        mock_http_client.request.side_effect = [first_page, second_page]
+        
+        result = scan_tools.tool_list_scan_results(patient_id=1)
+        
+        assert result.success is True
+        assert [row['id'] for row in result.data] == list(range(60))
+        assert mock_http_client.request.call_args_list == [
+            call('GET', '/api/scan-results/', params={'patient': 1}),
+            call('GET', next_url),
+        ]
+
+    def test_tool_list_scan_results_page_error(self, scan_tools, mock_http_client):
+        """Test a failing follow-up page fails the whole listing."""
+        first_page = MagicMock()
+        first_page.status_code = 200
+        first_page.content = orjson.dumps({
+            'count': 60,
+            'next': 'http://testserver/api/scan-results/?limit=50&offset=50',
+            'previous': None,
+            'results': [{'id': i} for i in range(50)],
+        })
+        failed_page = MagicMock()
+        failed_page.status_code = 500
+        mock_http_client.request.side_effect = [first_page, failed_page]
+        
+        result = scan_tools.tool_list_scan_results()
+        
+        assert result.success is False
+        assert result.error == "Failed to list scan results: 500"
+
 
 class TestToolManager:
     """Test main tool manager."""
     
     @pytest.fixture
     def mock_http_client(self):
-        """Mock HTTP client for testing."""
-        return MagicMock(spec=HttpClient)
+        """Fake HTTP client for testing (avoids MagicMock spec introspection)."""
+        return FakeHttpClient()
     
     @pytest.fixture
     def tool_manager(self, mock_http_client):
@@ -427,7 +569,7 @@ class TestToolManager:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 201
-        mock_response.json.return_value = {'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}
+        mock_response.content = orjson.dumps({'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'})
         mock_http_client.request.return_value = mock_response
         
         # Execute tool
@@ -449,7 +591,7 @@ class TestToolManager:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}]
+        mock_response.content = orjson.dumps([{'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}])
         mock_http_client.request.return_value = mock_response
         
         # Execute tool
@@ -465,7 +607,7 @@ class TestToolManager:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'}
+        mock_response.content = orjson.dumps({'id': 1, 'first_name': 'John', 'last_name': 'Doe', 'nric': 'S1234567A'})
         mock_http_client.request.return_value = mock_response
         
         # Execute tool
@@ -478,27 +620,17 @@ class TestToolManager:
 
     def test_execute_tool_update_patient(self, tool_manager, mock_http_client):
         """Test executing update patient tool."""
-        # Mock get response (for current data)
-        get_response = MagicMock()
-        get_response.status_code = 200
-        get_response.json.return_value = {
-            'id': 1,
-            'first_name': 'John',
-            'last_name': 'Doe',
-            'nric': 'S1234567A'
-        }
-        
         # Mock update response
         update_response = MagicMock()
         update_response.status_code = 200
-        update_response.json.return_value = {
+        update_response.content = orjson.dumps({
             'id': 1,
             'first_name': 'John',
             'last_name': 'Smith',
             'nric': 'S1234567A'
-        }
+        })
         
-        mock_http_client.request.side_effect = [get_response, update_response]
+        mock_http_client.request.return_value = update_response
         
         # Execute tool
         state_metrics = {'total_api_calls': 0, 'successful_ops': 0, 'aborted_ops': 0, 'retries': 0}
@@ -515,21 +647,11 @@ class TestToolManager:
 
     def test_execute_tool_delete_patient(self, tool_manager, mock_http_client):
         """Test executing delete patient tool."""
-        # Mock get response (for logging)
-        get_response = MagicMock()
-        get_response.status_code = 200
-        get_response.json.return_value = {
-            'id': 1,
-            'first_name': 'John',
-            'last_name': 'Doe',
-            'nric': 'S1234567A'
-        }
-        
         # Mock delete response
         delete_response = MagicMock()
         delete_response.status_code = 204
         
-        mock_http_client.request.side_effect = [get_response, delete_response]
+        mock_http_client.request.return_value = delete_response
         
         # Execute tool
         state_metrics = {'total_api_calls': 0, 'successful_ops': 0, 'aborted_ops': 0, 'retries': 0}
@@ -544,7 +666,7 @@ class TestToolManager:
         # Mock successful API response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{'id': 1, 'patient': 1, 'scan_type': 'wound'}]
+        mock_response.content = orjson.dumps([{'id': 1, 'patient': 1, 'scan_type': 'wound'}])
         mock_http_client.request.return_value = mock_response
         
         # Execute tool
@@ -3,18 +3,28 @@
 # Implements patient and scan result management operations for conversational interface
 
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Union, Any
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, ValidationError, field_validator
+import orjson
+from requests import Response
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
 
 from .enums import DownloadStage, Intent
-from .http_client import HttpClient
+from .http_client import HttpClient, HttpError
 from .logging_formatter import metrics_logger
 from .utils import mask_nric
 
 logger = logging.getLogger(__name__)
 
+# Short TTL for per-patient GET results; repeated fetches within a turn become dict lookups
+_PATIENT_CACHE_TTL_S = 5.0
+
+# Separators allowed in contact numbers, stripped in a single pass before the digit check
+_CONTACT_STRIP = str.maketrans('', '', '+- ')
+
 
 # ===== VALIDATION MODELS =====
 
@@ -46,8 +56,11 @@ class PatientInput(BaseModel):
         """Validate date format if provided."""
         if v is None:
             return v
+        # Shape check first: fromisoformat also accepts compact/week forms (e.g. 19900101)
+        if len(v) != 10 or v[4] != '-' or v[7] != '-':
+            raise ValueError("Date of birth must be in YYYY-MM-DD format")
         try:
-            datetime.strptime(v, '%Y-%m-%d')
+            date.fromisoformat(v)
             return v
         except ValueError:
             raise ValueError("Date of birth must be in YYYY-MM-DD format")
@@ -62,21 +75,50 @@ class PatientInput(BaseModel):
         if not v:
             return None
         # Basic validation for phone number format
-        if not v.replace('+', '').replace('-', '').replace(' ', '').isdigit():
+        if not v.translate(_CONTACT_STRIP).isdigit():
             raise ValueError("Contact number must contain only digits, +, -, and spaces")
         return v
 
 
-class ToolResponse(BaseModel):
-    """Standard response format for all tool operations."""
+class PatientUpdateInput(PatientInput):
+    """Partial variant of PatientInput for PATCH updates; only supplied fields are validated."""
+    first_name: Optional[str] = Field(None, min_length=1, max_length=50)
+    last_name: Optional[str] = Field(None, min_length=1, max_length=50)
+    nric: Optional[str] = Field(None, min_length=1, max_length=9)
+
+
+# Built once so create/update reuse the compiled validator and serializer
+_PATIENT_ADAPTER = TypeAdapter(PatientInput)
+_PATIENT_UPDATE_ADAPTER = TypeAdapter(PatientUpdateInput)
+
+
+@dataclass(slots=True)
+class ToolResponse:
+    """Standard response format for all tool operations.
+
+    Internal return container only (never parsed from untrusted input), so it is a
+    plain slotted dataclass rather than a validated Pydantic model.
+    """
     success: bool
     data: Optional[Union[Dict, List]] = None  # Allow both Dict and List
     error: Optional[str] = None
-    nric_masked: bool = Field(default=False, description="Whether NRIC was masked in logs")
+    nric_masked: bool = False  # Whether NRIC was masked in logs
     # Phase 8: Enhanced error handling
-    status_code: Optional[int] = Field(default=None, description="HTTP status code from backend")
-    validation_errors: Optional[Dict[str, List[str]]] = Field(default=None, description="Field-specific validation errors from 400 responses")
-    retryable: bool = Field(default=False, description="Whether operation can be safely retried")
+    status_code: Optional[int] = None  # HTTP status code from backend
+    validation_errors: Optional[Dict[str, List[str]]] = None  # Field-specific validation errors from 400 responses
+    retryable: bool = False  # Whether operation can be safely retried
+    bytes_size: int = 0  # Raw response body size, used for tool metrics
+
+
+def _json_loads(response: Response) -> Any:
+    """Decode a JSON response body with orjson (parses the raw bytes without decoding to str first)."""
+    return orjson.loads(response.content)
+
+
+def _body_size(response: Response) -> int:
+    """Size in bytes of the raw response body (0 when unavailable)."""
+    content = getattr(response, 'content', None)
+    return len(content) if isinstance(content, (bytes, bytearray)) else 0
 
 
 # ===== TOOL FUNCTIONS =====
@@ -86,8 +128,14 @@ class PatientTools:
     
     def __init__(self, http_client: HttpClient):
         self.http_client = http_client
+        # str(patient_id) -> (monotonic fetch time, patient data); invalidated on update/delete
+        self._patient_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    def _invalidate_patient(self, patient_id: int) -> None:
+        """Drop any cached GET result for a patient after it changes."""
+        self._patient_cache.pop(str(patient_id), None)
 
-    def _parse_400_validation_error(self, response) -> Dict[str, Any]:
+    def _parse_400_validation_error(self, response: Response) -> Dict[str, Any]:
         """
         Parse 400 validation error response from Django REST Framework.
         
@@ -98,21 +146,19 @@ class PatientTools:
             Dict with 'summary' (user-friendly message) and 'field_errors' (field-specific issues)
         """
         try:
-            error_data = response.json()
-            field_errors = {}
-            error_messages = []
-            
-            if isinstance(error_data, dict):
-                for field_name, field_issues in error_data.items():
-                    if isinstance(field_issues, list):
-                        field_errors[field_name] = field_issues
-                        error_messages.append(f"{field_name}: {', '.join(field_issues)}")
-                    else:
-                        field_errors[field_name] = [str(field_issues)]
-                        error_messages.append(f"{field_name}: {field_issues}")
+            error_data = _json_loads(response)
+            
+            if type(error_data) is dict:
+                # Fast path for DRF's canonical {field: [message, ...]} shape
+                field_errors = {
+                    field_name: field_issues if type(field_issues) is list else [str(field_issues)]
+                    for field_name, field_issues in error_data.items()
+                }
+                error_messages = [f"{field_name}: {', '.join(issues)}" for field_name, issues in field_errors.items()]
             else:
                 # Fallback for non-dict error responses
-                error_messages.append(str(error_data))
+                field_errors = {}
+                error_messages = [str(error_data)]
                 
             summary = '; '.join(error_messages) if error_messages else "Validation error"
             
@@ -128,7 +174,7 @@ class PatientTools:
                 'field_errors': {}
             }
 
-    def tool_create_patient(self, **kwargs) -> ToolResponse:
+    def tool_create_patient(self, **kwargs: Any) -> ToolResponse:
         """
         Create a new patient with validation and NRIC masking.
         
@@ -140,21 +186,23 @@ class PatientTools:
         """
         try:
             # Validate input using Pydantic model
-            patient_input = PatientInput(**kwargs)
+            patient_input = _PATIENT_ADAPTER.validate_python(kwargs)
             
             # Log creation attempt with masked NRIC
-            logger.info(f"[Tools] 🏥 Creating patient: {patient_input.first_name} {patient_input.last_name}, NRIC: {mask_nric(patient_input.nric)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[Tools] 🏥 Creating patient: %s %s, NRIC: %s", patient_input.first_name,
+                            patient_input.last_name, mask_nric(patient_input.nric))
             
             # Prepare payload for API
-            payload = patient_input.model_dump(exclude_none=True)
+            payload = _PATIENT_ADAPTER.dump_python(patient_input, exclude_none=True)
             
             # Call REST API
             response = self.http_client.request('POST', '/api/patients/', json=payload)
             
             if response.status_code == 201:
-                patient_data = response.json()
-                logger.info(f"[Tools] ✅ Patient created successfully - ID: {patient_data.get('id')}")
-                return ToolResponse(success=True, data=patient_data, nric_masked=True)
+                patient_data = _json_loads(response)
+                logger.info("[Tools] ✅ Patient created successfully - ID: %s", patient_data.get('id'))
+                return ToolResponse(success=True, data=patient_data, nric_masked=True, bytes_size=_body_size(response))
             elif response.status_code == 400:
                 # Parse validation errors and extract field-specific issues
                 error_detail = self._parse_400_validation_error(response)
@@ -197,16 +245,18 @@ class PatientTools:
             response = self.http_client.request('GET', '/api/patients/', params=params)
             
             if response.status_code == 200:
-                patients_data = response.json()
+                patients_data = _json_loads(response)
                 patient_count = len(patients_data)
                 
-                # Log with masked NRICs
-                for patient in patients_data:
-                    if 'nric' in patient:
-                        logger.info(f"[Tools] Patient {patient.get('id')}: {patient.get('first_name')} {patient.get('last_name')}, NRIC: {mask_nric(patient['nric'])}")
+                # Log with masked NRICs (skip the loop entirely when INFO is off)
+                if logger.isEnabledFor(logging.INFO):
+                    for patient in patients_data:
+                        if 'nric' in patient:
+                            logger.info("[Tools] Patient %s: %s %s, NRIC: %s", patient.get('id'),
+                                        patient.get('first_name'), patient.get('last_name'), mask_nric(patient['nric']))
                 
-                logger.info(f"[Tools] ✅ Listed {patient_count} patients")
-                return ToolResponse(success=True, data=patients_data, nric_masked=True)
+                logger.info("[Tools] ✅ Listed %d patients", patient_count)
+                return ToolResponse(success=True, data=patients_data, nric_masked=True, bytes_size=_body_size(response))
             else:
                 error_msg = f"Failed to list patients: {response.status_code}"
                 logger.error(f"[Tools] ❌ {error_msg}")
@@ -217,31 +267,42 @@ class PatientTools:
             logger.error(f"[Tools] ❌ {error_msg}")
             return ToolResponse(success=False, error=error_msg)
 
-    def tool_get_patient(self, patient_id: int) -> ToolResponse:
+    def tool_get_patient(self, patient_id: int, use_cache: bool = True) -> ToolResponse:
         """
         Get a specific patient by ID with NRIC masking in logs.
         
         Args:
             patient_id: Patient ID to retrieve
+            use_cache: Serve a result fetched within the last few seconds; pass False
+                when the record will be written back (the cache misses writes made
+                by other processes, e.g. the web UI)
             
         Returns:
             ToolResponse with patient data or error
         """
         try:
-            logger.info(f"[Tools] 🔍 Getting patient ID: {patient_id}")
+            logger.info("[Tools] 🔍 Getting patient ID: %s", patient_id)
+            
+            cached = self._patient_cache.get(str(patient_id)) if use_cache else None
+            if cached is not None and time.monotonic() - cached[0] < _PATIENT_CACHE_TTL_S:
+                logger.info("[Tools] ✅ Retrieved patient ID: %s (cached)", patient_id)
+                return ToolResponse(success=True, data=dict(cached[1]), nric_masked=True)
             
             # Call REST API
             response = self.http_client.request('GET', f'/api/patients/{patient_id}/')
             
             if response.status_code == 200:
-                patient_data = response.json()
+                patient_data = _json_loads(response)
+                if isinstance(patient_data, dict):
+                    self._patient_cache[str(patient_id)] = (time.monotonic(), dict(patient_data))
                 
                 # Log with masked NRIC
-                if 'nric' in patient_data:
-                    logger.info(f"[Tools] Found patient: {patient_data.get('first_name')} {patient_data.get('last_name')}, NRIC: {mask_nric(patient_data['nric'])}")
+                if 'nric' in patient_data and logger.isEnabledFor(logging.INFO):
+                    logger.info("[Tools] Found patient: %s %s, NRIC: %s", patient_data.get('first_name'),
+                                patient_data.get('last_name'), mask_nric(patient_data['nric']))
                 
-                logger.info(f"[Tools] ✅ Retrieved patient ID: {patient_id}")
-                return ToolResponse(success=True, data=patient_data, nric_masked=True)
+                logger.info("[Tools] ✅ Retrieved patient ID: %s", patient_id)
+                return ToolResponse(success=True, data=patient_data, nric_masked=True, bytes_size=_body_size(response))
             elif response.status_code == 404:
                 error_msg = f"Patient with ID {patient_id} not found"
                 logger.warning(f"[Tools] ⚠️ {error_msg}")
@@ -256,9 +317,41 @@ class PatientTools:
             logger.error(f"[Tools] ❌ {error_msg}")
             return ToolResponse(success=False, error=error_msg)
 
-    def tool_update_patient(self, patient_id: int, **kwargs) -> ToolResponse:
+    def _merge_for_put(self, current_data: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Update a patient using PUT semantics with validation and NRIC masking.
+        Build a full PUT payload by merging updates into the current patient record.
+        
+        Args:
+            current_data: Patient record as returned by the backend
+            updates: Fields to change
+            
+        Returns:
+            Validated payload dict for a PUT request
+        """
+        # Merge current data with updates (copy first; current_data may be a cached record)
+        update_data = current_data.copy()
+        update_data.update(updates)
+        
+        # Remove read-only fields
+        update_data.pop('id', None)
+        update_data.pop('user', None)
+        
+        # Validate merged data
+        patient_input = _PATIENT_ADAPTER.validate_python(update_data)
+        
+        # Log update with masked NRIC
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[Tools] Updating patient: %s %s, NRIC: %s", patient_input.first_name,
+                        patient_input.last_name, mask_nric(patient_input.nric))
+        
+        return _PATIENT_ADAPTER.dump_python(patient_input, exclude_none=True)
+
+    def tool_update_patient(self, patient_id: int, **kwargs: Any) -> ToolResponse:
+        """
+        Update a patient using PATCH semantics with validation and NRIC masking.
+        
+        Only the supplied fields are validated and sent. Backends that reject PATCH
+        with 405 fall back to the GET + merge + PUT flow.
         
         Args:
             patient_id: Patient ID to update
@@ -268,38 +361,38 @@ class PatientTools:
             ToolResponse with updated patient data or error
         """
         try:
-            # First, get current patient data
-            logger.info(f"[Tools] 📝 Updating patient ID: {patient_id}")
-            
-            current_response = self.tool_get_patient(patient_id)
-            if not current_response.success:
-                return current_response
+            logger.info("[Tools] 📝 Updating patient ID: %s", patient_id)
+            
+            # Validate only the fields being changed
+            patient_update = _PATIENT_UPDATE_ADAPTER.validate_python(kwargs)
+            payload = _PATIENT_UPDATE_ADAPTER.dump_python(patient_update, exclude_none=True)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[Tools] Updating patient ID %s fields: %s", patient_id, ', '.join(payload) or 'none')
+            
+            # Call REST API with PATCH
+            try:
+                response = self.http_client.request('PATCH', f'/api/patients/{patient_id}/', json=payload)
+            except HttpError as e:
+                if e.response.status_code != 405:
+                    raise
+                response = e.response
+            
+            if response.status_code == 405:
+                logger.info("[Tools] PATCH not allowed by backend, falling back to GET + PUT")
+                # Fresh read: a cached snapshot could overwrite a change made in the meantime
+                current_response = self.tool_get_patient(patient_id, use_cache=False)
+                if not current_response.success:
+                    return current_response
                 
-            current_data = current_response.data or {}
-            
-            # Merge current data with updates
-            update_data = {**current_data, **kwargs}
-            
-            # Remove read-only fields
-            update_data.pop('id', None)
-            update_data.pop('user', None)
-            
-            # Validate merged data
-            patient_input = PatientInput(**update_data)
+                put_payload = self._merge_for_put(current_response.data or {}, kwargs)
+                response = self.http_client.request('PUT', f'/api/patients/{patient_id}/', json=put_payload)
             
-            # Log update with masked NRIC
-            logger.info(f"[Tools] Updating patient: {patient_input.first_name} {patient_input.last_name}, NRIC: {mask_nric(patient_input.nric)}")
-            
-            # Prepare payload for API
-            payload = patient_input.model_dump(exclude_none=True)
-            
-            # Call REST API with PUT
-            response = self.http_client.request('PUT', f'/api/patients/{patient_id}/', json=payload)
+            self._invalidate_patient(patient_id)
             
             if response.status_code == 200:
-                patient_data = response.json()
-                logger.info(f"[Tools] ✅ Patient updated successfully - ID: {patient_id}")
-                return ToolResponse(success=True, data=patient_data, nric_masked=True)
+                patient_data = _json_loads(response)
+                logger.info("[Tools] ✅ Patient updated successfully - ID: %s", patient_id)
+                return ToolResponse(success=True, data=patient_data, nric_masked=True, bytes_size=_body_size(response))
             elif response.status_code == 400:
                 # Parse validation errors and extract field-specific issues
                 error_detail = self._parse_400_validation_error(response)
@@ -339,29 +432,15 @@ class PatientTools:
             ToolResponse with success status or error
         """
         try:
-            # First get patient info for logging
-            logger.info(f"[Tools] 🗑️ Deleting patient ID: {patient_id}")
+            logger.info("[Tools] 🗑️ Deleting patient ID: %s", patient_id)
             
-            patient_response = self.tool_get_patient(patient_id)
-            if not patient_response.success:
-                return patient_response
-                
-            patient_data = patient_response.data or {}
-            # Handle both dict and potential list responses safely
-            if isinstance(patient_data, dict):
-                patient_name = f"{patient_data.get('first_name', 'Unknown')} {patient_data.get('last_name', 'Unknown')}"
-                masked_nric = mask_nric(patient_data.get('nric', ''))
-            else:
-                # Fallback for unexpected data format
-                patient_name = f"Patient ID {patient_id}"
-                masked_nric = "***UNKNOWN***"
-            
-            # Call REST API
+            # Call REST API directly; no pre-fetch, the ID is enough for the audit log
             response = self.http_client.request('DELETE', f'/api/patients/{patient_id}/')
+            self._invalidate_patient(patient_id)
             
             if response.status_code == 204:
-                logger.info(f"[Tools] ✅ Patient deleted successfully - {patient_name}, NRIC: {masked_nric}")
-                return ToolResponse(success=True, data={'message': f'Patient {patient_name} deleted successfully'}, nric_masked=True)
+                logger.info("[Tools] ✅ Patient deleted successfully - ID: %s", patient_id)
+                return ToolResponse(success=True, data={'message': f'Patient ID {patient_id} deleted successfully'}, nric_masked=True)
             elif response.status_code == 404:
                 error_msg = f"Patient with ID {patient_id} not found"
                 logger.warning(f"[Tools] ⚠️ {error_msg}")
@@ -387,16 +466,19 @@ class ScanTools:
         """
         List scan results with optional patient filter and limit.
         
+        The endpoint is paginated, so every page is fetched by following `next`
+        until it is null; `limit` caps the rows returned, not the page size.
+        
         Args:
             patient_id: Optional patient ID to filter results
             limit: Optional limit on number of results
             
         Returns:
-            ToolResponse with scan results or error
+            ToolResponse with a list of scan results or error
         """
         try:
             if patient_id:
-                logger.info(f"[Tools] 🔬 Listing scan results for patient ID: {patient_id}")
+                logger.info("[Tools] 🔬 Listing scan results for patient ID: %s", patient_id)
             else:
                 logger.info("[Tools] 🔬 Listing all scan results")
             
@@ -404,18 +486,29 @@ class ScanTools:
             params = {}
             if patient_id:
                 params['patient'] = patient_id
-            if limit:
-                params['limit'] = limit
             
             # Call REST API
             response = self.http_client.request('GET', '/api/scan-results/', params=params)
+            results: List[Dict[str, Any]] = []
+            bytes_size = 0
+            while response.status_code == 200:
+                page = _json_loads(response)
+                bytes_size += _body_size(response)
+                # Paginated responses wrap the rows as {count, next, previous, results}
+                if not isinstance(page, dict):
+                    results = page
+                    break
+                results.extend(page.get('results', []))
+                next_url = page.get('next')
+                if not next_url:
+                    break
+                response = self.http_client.request('GET', next_url)
             
             if response.status_code == 200:
-                results_data = response.json()
-                result_count = len(results_data)
-                
-                logger.info(f"[Tools] ✅ Listed {result_count} scan results")
-                return ToolResponse(success=True, data=results_data)
+                if limit:
+                    results = results[:limit]
+                logger.info("[Tools] ✅ Listed %d scan results", len(results))
+                return ToolResponse(success=True, data=results, bytes_size=bytes_size)
             else:
                 error_msg = f"Failed to list scan results: {response.status_code}"
                 logger.error(f"[Tools] ❌ {error_msg}")
@@ -436,8 +529,19 @@ class ToolManager:
         self.http_client = http_client
         self.patient_tools = PatientTools(http_client)
         self.scan_tools = ScanTools(http_client)
+        # Metrics handler I/O runs on a QueueListener thread, started on first use rather than at import
+        metrics_logger.start_queue_listener()
+        # Intent -> bound tool method; one dict lookup per call instead of an if/elif chain
+        self._dispatch: Dict[Intent, Callable[..., ToolResponse]] = {
+            Intent.CREATE_PATIENT: self.patient_tools.tool_create_patient,
+            Intent.LIST_PATIENTS: self.patient_tools.tool_list_patients,
+            Intent.GET_PATIENT_DETAILS: self.patient_tools.tool_get_patient,
+            Intent.UPDATE_PATIENT: self.patient_tools.tool_update_patient,
+            Intent.DELETE_PATIENT: self.patient_tools.tool_delete_patient,
+            Intent.GET_SCAN_RESULTS: self.scan_tools.tool_list_scan_results,
+        }
         
-    def execute_tool(self, intent: Intent, state_metrics: Dict[str, int], **kwargs) -> ToolResponse:
+    def execute_tool(self, intent: Intent, state_metrics: Dict[str, int], **kwargs: Any) -> ToolResponse:
         """
         Execute appropriate tool based on intent and parameters with metrics tracking.
         
@@ -456,19 +560,9 @@ class ToolManager:
         
         try:
             # Execute the appropriate tool based on intent
-            result = None
-            if intent == Intent.CREATE_PATIENT:
-                result = self.patient_tools.tool_create_patient(**kwargs)
-            elif intent == Intent.LIST_PATIENTS:
-                result = self.patient_tools.tool_list_patients(**kwargs)
-            elif intent == Intent.GET_PATIENT_DETAILS:
-                result = self.patient_tools.tool_get_patient(**kwargs)
-            elif intent == Intent.UPDATE_PATIENT:
-                result = self.patient_tools.tool_update_patient(**kwargs)
-            elif intent == Intent.DELETE_PATIENT:
-                result = self.patient_tools.tool_delete_patient(**kwargs)
-            elif intent == Intent.GET_SCAN_RESULTS:
-                result = self.scan_tools.tool_list_scan_results(**kwargs)
+            tool_fn = self._dispatch.get(intent)
+            if tool_fn is not None:
+                result = tool_fn(**kwargs)
             else:
                 error_msg = f"No tool available for intent: {intent.name}"
                 logger.error(f"[Tools] ❌ {error_msg}")
@@ -476,8 +570,7 @@ class ToolManager:
             
             # Track metrics based on result
             if result and result.success:
-                response_size = len(str(result.data)) if result.data else 0
-                metrics_logger.log_tool_call_success(tool_name, state_metrics, response_size)
+                metrics_logger.log_tool_call_success(tool_name, state_metrics, result.bytes_size)
             else:
                 error = Exception(result.error if result else "Unknown tool error")
                 metrics_logger.log_tool_call_error(tool_name, error, state_metrics)
@@ -2,17 +2,26 @@ from __future__ import annotations
 import re
 from datetime import datetime, timezone
 
-NRIC_REGEX = re.compile(r'^[STFG]\d{7}[A-Z]$')
+# Kept for callers that need the pattern itself; validate_nric uses a fixed-shape check
+NRIC_REGEX = re.compile(r'^[STFG]\d{7}[A-Z]$', re.ASCII)
+_NRIC_PREFIXES = frozenset('STFG')
 
 def validate_nric(nric: str) -> bool:
-    return bool(NRIC_REGEX.match(nric))
+    return (
+        len(nric) == 9
+        and nric[0] in _NRIC_PREFIXES
+        and nric[1:8].isascii() and nric[1:8].isdecimal()
+        and 'A' <= nric[8] <= 'Z'
+    )
+
+_MASK_MID = '*' * 6
 
 def mask_nric(nric: str) -> str:
     if not nric:
         return nric
     if len(nric) < 3:
         return nric[0] + '*' * (len(nric) - 1)
-    return f"{nric[0]}******{nric[-2:]}"
+    return nric[0] + _MASK_MID + nric[-2:]
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -2,22 +2,32 @@
 # Phase 11: Django Endpoint Implementation for `/api/hydrochat/converse/`
 
 import logging
+import time
 import uuid
+import weakref
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any
-from threading import Lock
+from typing import Dict, Optional, Any, Tuple, Union
+from threading import Event, Lock, Thread
 
+import orjson
+from redis import Redis, RedisError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
+from config.redis_config import RedisConfig
+
 from .conversation_graph import ConversationGraph, create_conversation_graph
 from .state import ConversationState
-from .http_client import HttpClient
+from .http_client import HttpClient, client as shared_http_client
 from .config import load_config
-from .enums import Intent, PendingAction, ConfirmationType, DownloadStage
+from .enums import Intent
 from .utils import mask_nric
+from .performance import get_performance_summary
+from .gemini_client import get_gemini_metrics_v2
+from .metrics_store import get_global_metrics_store
 
 logger = logging.getLogger(__name__)
 
@@ -31,83 +41,62 @@ class ConversationStateStore:
     Implements simple LRU and timestamp-based eviction.
     """
     
-    def __init__(self, max_conversations: int = 100, ttl_minutes: int = 30):
-        self.store: Dict[str, Dict[str, Any]] = {}
-        self.access_times: Dict[str, datetime] = {}
+    def __init__(self, max_conversations: int = 100, ttl_minutes: int = 30, sweep_interval_s: Optional[float] = None):
+        # conversation_id -> (last access time, state), kept in access order
+        # (oldest first) so LRU and TTL eviction both pop from the front in O(1)
+        # Access times are time.monotonic() floats: cheap to compare and immune to clock steps
+        self.store: OrderedDict[str, Tuple[float, ConversationState]] = OrderedDict()
         self.max_conversations = max_conversations
         self.ttl_minutes = ttl_minutes
+        self._ttl_seconds = ttl_minutes * 60
+        # Full TTL sweeps run on a background thread (default: every ttl/2); reads only
+        # check the accessed entry
+        self.sweep_interval_s = sweep_interval_s if sweep_interval_s is not None else max(ttl_minutes * 30.0, 1.0)
         self._lock = Lock()
+        self._stop_sweeper = Event()
+        self._sweeper = Thread(
+            target=self._sweep_loop, args=(weakref.ref(self), self._stop_sweeper, self.sweep_interval_s),
+            name="hydrochat-state-sweeper", daemon=True,
+        )
+        self._sweeper.start()
         
         logger.info(f"[STATE_STORE] 🗄️ Initialized with max_conversations={max_conversations}, ttl_minutes={ttl_minutes}")
     
+    @staticmethod
+    def _sweep_loop(store_ref: 'weakref.ReferenceType[ConversationStateStore]', stop: Event, interval_s: float) -> None:
+        """Periodically evict expired entries; exits on close() or once the store is garbage collected."""
+        while not stop.wait(interval_s):
+            store = store_ref()
+            if store is None:
+                return
+            with store._lock:
+                store._evict_expired()
+            del store
+    
+    def close(self) -> None:
+        """Stop the background sweeper thread."""
+        self._stop_sweeper.set()
+    
     def get(self, conversation_id: str) -> Optional[ConversationState]:
         """Get conversation state by ID, returning None if not found or expired."""
         with self._lock:
-            # Clean expired entries first
-            self._evict_expired()
-            
-            if conversation_id not in self.store:
+            entry = self.store.get(conversation_id)
+            if entry is None:
                 logger.info(f"[STATE_STORE] 🔍 Conversation {conversation_id[:8]}... not found")
                 return None
             
-            # Check if this specific conversation has expired (additional check)
-            if conversation_id in self.access_times:
-                # Special case: TTL=0 means immediate expiration
-                if self.ttl_minutes == 0:
-                    # Remove immediately
-                    if conversation_id in self.store:
-                        del self.store[conversation_id]
-                    if conversation_id in self.access_times:
-                        del self.access_times[conversation_id]
-                    logger.info(f"[STATE_STORE] 🗑️ Evicted expired conversation {conversation_id[:8]}... on access")
-                    return None
-                else:
-                    cutoff_time = datetime.now() - timedelta(minutes=self.ttl_minutes)
-                    if self.access_times[conversation_id] < cutoff_time:
-                        # Remove expired conversation
-                        if conversation_id in self.store:
-                            del self.store[conversation_id]
-                        if conversation_id in self.access_times:
-                            del self.access_times[conversation_id]
-                        logger.info(f"[STATE_STORE] 🗑️ Evicted expired conversation {conversation_id[:8]}... on access")
-                        return None
-            
-            # Update access time
-            self.access_times[conversation_id] = datetime.now()
-            state_data = self.store[conversation_id]
-            
-            # Reconstruct ConversationState from stored data
-            conv_state = ConversationState()
-            
-            # Reconstruct deque for recent_messages
-            from collections import deque
-            conv_state.recent_messages = deque(state_data['recent_messages'], maxlen=5)
+            # The sweeper runs off the request path, so the accessed entry is checked here
+            # Special case: TTL=0 means immediate expiration
+            now = time.monotonic()
+            if self.ttl_minutes == 0 or entry[0] < now - self._ttl_seconds:
+                del self.store[conversation_id]
+                logger.info(f"[STATE_STORE] 🗑️ Evicted expired conversation {conversation_id[:8]}... on access")
+                return None
             
-            # Reconstruct core fields
-            conv_state.history_summary = state_data['history_summary']
-            conv_state.intent = Intent[state_data['intent']] if state_data['intent'] != 'UNKNOWN' else Intent.UNKNOWN
-            conv_state.pending_action = PendingAction[state_data['pending_action']]
-            conv_state.extracted_fields = state_data['extracted_fields']
-            conv_state.validated_fields = state_data['validated_fields']
-            conv_state.pending_fields = set(state_data['pending_fields'])
-            conv_state.patient_cache = state_data['patient_cache']
-            conv_state.patient_cache_timestamp = datetime.fromisoformat(state_data['patient_cache_timestamp'])
-            conv_state.disambiguation_options = state_data['disambiguation_options']
-            conv_state.selected_patient_id = state_data['selected_patient_id']
-            conv_state.clarification_loop_count = state_data['clarification_loop_count']
-            conv_state.confirmation_required = state_data['confirmation_required']
-            conv_state.awaiting_confirmation_type = ConfirmationType[state_data['awaiting_confirmation_type']]
-            conv_state.last_patient_snapshot = state_data['last_patient_snapshot']
-            conv_state.last_tool_request = state_data['last_tool_request']
-            conv_state.last_tool_response = state_data['last_tool_response']
-            conv_state.last_tool_error = state_data['last_tool_error']
-            conv_state.scan_results_buffer = state_data['scan_results_buffer']
-            conv_state.scan_pagination_offset = state_data['scan_pagination_offset']
-            conv_state.scan_display_limit = state_data['scan_display_limit']
-            conv_state.download_stage = DownloadStage[state_data['download_stage']]
-            conv_state.metrics = state_data['metrics']
-            conv_state.nric_policy = state_data['nric_policy']
-            conv_state.config_snapshot = state_data['config_snapshot']
+            # Update access time and mark as most recently used
+            conv_state = entry[1]
+            self.store[conversation_id] = (now, conv_state)
+            self.store.move_to_end(conversation_id)
             
             logger.info(f"[STATE_STORE] ✅ Retrieved conversation {conversation_id[:8]}...")
             return conv_state
@@ -119,42 +108,37 @@ class ConversationStateStore:
             if len(self.store) >= self.max_conversations and conversation_id not in self.store:
                 self._evict_lru()
             
-            # Store serialized state
-            state_dict = state.serialize_snapshot()
-            self.store[conversation_id] = state_dict
-            self.access_times[conversation_id] = datetime.now()
+            # Store the live object; serialize_snapshot() is only needed for out-of-process persistence
+            self.store[conversation_id] = (time.monotonic(), state)
+            self.store.move_to_end(conversation_id)
             
             logger.info(f"[STATE_STORE] 💾 Stored conversation {conversation_id[:8]}...")
     
     def _evict_expired(self) -> None:
         """Remove expired conversations based on TTL."""
-        # Special case: TTL=0 means immediate expiration (all conversations expire)
-        if self.ttl_minutes == 0:
-            expired_ids = list(self.access_times.keys())
-        else:
-            cutoff_time = datetime.now() - timedelta(minutes=self.ttl_minutes)
-            expired_ids = [
-                conv_id for conv_id, access_time in self.access_times.items()
-                if access_time < cutoff_time
-            ]
-        
-        for conv_id in expired_ids:
-            if conv_id in self.store:
-                del self.store[conv_id]
-            if conv_id in self.access_times:
-                del self.access_times[conv_id]
+        # Entries are in access order, so expired ones form a prefix of the store
+        cutoff_time = time.monotonic() - self._ttl_seconds
+        while self.store:
+            conv_id, (access_time, _) = next(iter(self.store.items()))
+            # Special case: TTL=0 means immediate expiration (all conversations expire)
+            if self.ttl_minutes != 0 and access_time >= cutoff_time:
+                break
+            del self.store[conv_id]
             logger.info(f"[STATE_STORE] 🗑️ Evicted expired conversation {conv_id[:8]}...")
     
     def _evict_lru(self) -> None:
         """Remove least recently used conversation."""
-        if not self.access_times:
+        if not self.store:
             return
         
-        lru_id = min(self.access_times.keys(), key=lambda x: self.access_times[x])
-        del self.store[lru_id]
-        del self.access_times[lru_id]
+        lru_id, _ = self.store.popitem(last=False)
         logger.info(f"[STATE_STORE] 🗑️ Evicted LRU conversation {lru_id[:8]}...")
     
+    @staticmethod
+    def _to_datetime(monotonic_ts: float) -> datetime:
+        """Convert a monotonic access time to wall-clock time for reporting."""
+        return datetime.now() - timedelta(seconds=time.monotonic() - monotonic_ts)
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get store statistics for monitoring."""
         with self._lock:
@@ -163,13 +147,107 @@ class ConversationStateStore:
                 'active_conversations': len(self.store),
                 'max_conversations': self.max_conversations,
                 'ttl_minutes': self.ttl_minutes,
-                'oldest_access': min(self.access_times.values()) if self.access_times else None,
-                'newest_access': max(self.access_times.values()) if self.access_times else None,
+                'oldest_access': self._to_datetime(next(iter(self.store.values()))[0]) if self.store else None,
+                'newest_access': self._to_datetime(next(reversed(self.store.values()))[0]) if self.store else None,
             }
 
 
+# ===== REDIS STATE STORE =====
+
+class RedisConversationStateStore:
+    """
+    Redis-backed conversation state store shared across worker processes.
+    
+    Each conversation is one Redis hash (one field per snapshot key, values
+    orjson-encoded) with a server-side TTL refreshed on access. Small hashes use
+    Redis's compact listpack encoding; expiry and memory-pressure eviction are
+    handled by Redis rather than a local sweep, so no process-level lock is needed.
+    
+    Redis errors are handled per call (Phase 18 graceful fallback): a failed read
+    starts a fresh conversation and a failed write is logged, so an outage degrades
+    to stateless turns instead of failing requests or splitting state per worker.
+    """
+    
+    KEY_PREFIX = 'hc:conv:'
+    
+    def __init__(self, client: Redis, max_conversations: int = 100, ttl_minutes: int = 30):
+        self.client = client
+        self.max_conversations = max_conversations
+        self.ttl_minutes = ttl_minutes
+        
+        logger.info(f"[STATE_STORE] 🗄️ Initialized Redis store with ttl_minutes={ttl_minutes}")
+    
+    def _key(self, conversation_id: str) -> str:
+        return f"{self.KEY_PREFIX}{conversation_id}"
+    
+    def get(self, conversation_id: str) -> Optional[ConversationState]:
+        """Get conversation state by ID, returning None if not found, expired or Redis is unavailable."""
+        fields: Dict[str, Any] = {}
+        if self.ttl_minutes:
+            # Read the hash and slide its TTL in one round trip
+            key = self._key(conversation_id)
+            pipe = self.client.pipeline()
+            pipe.hgetall(key)
+            pipe.expire(key, self.ttl_minutes * 60)
+            try:
+                fields = pipe.execute()[0]
+            except RedisError as e:
+                logger.warning(f"[STATE_STORE] ⚠️ Redis unavailable, cannot load conversation {conversation_id[:8]}...: {e}")
+                return None
+        if not fields:
+            logger.info(f"[STATE_STORE] 🔍 Conversation {conversation_id[:8]}... not found")
+            return None
+        
+        logger.info(f"[STATE_STORE] ✅ Retrieved conversation {conversation_id[:8]}...")
+        return ConversationState.from_snapshot({name: orjson.loads(value) for name, value in fields.items()})
+    
+    def put(self, conversation_id: str, state: ConversationState) -> None:
+        """Store conversation state by ID with a server-side TTL; logged and skipped if Redis is unavailable."""
+        # TTL=0 means immediate expiration, so there is nothing to keep
+        if not self.ttl_minutes:
+            return
+        key = self._key(conversation_id)
+        mapping = {name: orjson.dumps(value) for name, value in state.serialize_snapshot().items()}
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self.ttl_minutes * 60)
+        try:
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"[STATE_STORE] ⚠️ Redis unavailable, conversation {conversation_id[:8]}... not stored: {e}")
+            return
+        logger.info(f"[STATE_STORE] 💾 Stored conversation {conversation_id[:8]}...")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics for monitoring (per-key access times are not tracked)."""
+        try:
+            active_conversations = sum(1 for _ in self.client.scan_iter(match=f"{self.KEY_PREFIX}*", count=500))
+        except RedisError as e:
+            logger.warning(f"[STATE_STORE] ⚠️ Redis unavailable, conversation count unknown: {e}")
+            active_conversations = None
+        return {
+            'active_conversations': active_conversations,
+            'max_conversations': self.max_conversations,
+            'ttl_minutes': self.ttl_minutes,
+            'oldest_access': None,
+            'newest_access': None,
+        }
+
+
+def create_conversation_store() -> Union[ConversationStateStore, RedisConversationStateStore]:
+    """
+    Use the Redis store when USE_REDIS_STATE is set, else in-memory.
+    
+    The choice depends on configuration alone so every worker uses the same backend;
+    Redis is not contacted here, and outages are handled per call by the Redis store.
+    """
+    if RedisConfig.is_enabled():
+        return RedisConversationStateStore(RedisConfig.get_client())
+    return ConversationStateStore()
+
+
 # Global state store instance
-conversation_store = ConversationStateStore()
+conversation_store = create_conversation_store()
 
 # Global conversation graph instance
 _conversation_graph: Optional[ConversationGraph] = None
@@ -180,10 +258,16 @@ def get_conversation_graph() -> ConversationGraph:
     """Get or create the global conversation graph instance."""
     global _conversation_graph
     
+    # Fast path: the graph never changes once built, so skip the lock after first init
+    graph = _conversation_graph
+    if graph is not None:
+        return graph
+    
     with _graph_lock:
         if _conversation_graph is None:
             config = load_config()
-            http_client = HttpClient()
+            # Share the module-level client's pooled session so keep-alive connections are reused
+            http_client = HttpClient(session=shared_http_client.session)
             _conversation_graph = create_conversation_graph(http_client)
             logger.info("[CONVERSE_API] 🤖 Global conversation graph initialized")
         
@@ -192,6 +276,13 @@ def get_conversation_graph() -> ConversationGraph:
 
 # ===== API VIEWS =====
 
+# Intent -> agent_op reported after a successful write
+_INTENT_AGENT_OP: Dict[Intent, str] = {
+    Intent.CREATE_PATIENT: "CREATE",
+    Intent.UPDATE_PATIENT: "UPDATE",
+    Intent.DELETE_PATIENT: "DELETE",
+}
+
 class ConverseAPIView(APIView):
     """
     HydroChat conversation endpoint.
@@ -319,25 +410,10 @@ class ConverseAPIView(APIView):
         
         Returns: "CREATE", "UPDATE", "DELETE", or "NONE"
         """
-        # Check if we just completed a successful operation
+        # Only a just-completed successful write maps to an op; pending or read-only
+        # operations report NONE
         if conv_state.last_tool_response and conv_state.last_tool_response.get('success'):
-            # Check if there was a recent successful tool execution
-            if conv_state.intent == Intent.CREATE_PATIENT:
-                return "CREATE"
-            elif conv_state.intent == Intent.UPDATE_PATIENT:
-                return "UPDATE"
-            elif conv_state.intent == Intent.DELETE_PATIENT:
-                return "DELETE"
-        
-        # Check pending action for operations in progress that may complete
-        if conv_state.pending_action == PendingAction.CREATE_PATIENT:
-            return "NONE"  # Still in progress
-        elif conv_state.pending_action == PendingAction.UPDATE_PATIENT:
-            return "NONE"  # Still in progress
-        elif conv_state.pending_action == PendingAction.DELETE_PATIENT:
-            return "NONE"  # Still in progress
-        
-        # Default to NONE for read operations or no operation
+            return _INTENT_AGENT_OP.get(conv_state.intent, "NONE")
         return "NONE"
 
 
@@ -400,11 +476,6 @@ class MetricsExportAPIView(APIView):
             
             logger.info(f"[METRICS_EXPORT] 📊 Exporting metrics for user {request.user.username}")
             
-            # Import metrics modules
-            from .performance import get_performance_summary
-            from .gemini_client import get_gemini_metrics_v2
-            from .metrics_store import get_global_metrics_store
-            
             # Gather performance metrics
             performance_summary = get_performance_summary()
             
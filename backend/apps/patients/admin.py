@@ -21,3 +21,7 @@ class PatientAdmin(admin.ModelAdmin):
             'fields': ('user',)
         }),
     )
+
+    def get_queryset(self, request):
+        # list_display shows the owning user; join it once instead of one query per row
+        return super().get_queryset(request).select_related('user')
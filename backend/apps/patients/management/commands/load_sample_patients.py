@@ -5,6 +5,9 @@ from django.contrib.auth.models import User
 from apps.patients.models import Patient
 from django.db import transaction
 
+_NRIC_DIGITS = '0123456789'
+_NRIC_SUFFIX = 'ABCDEFGHIZJ'
+
 class Command(BaseCommand):
     help = 'Load sample patient data, generating random NRICs and phone numbers for missing entries.'
 
@@ -21,14 +24,15 @@ class Command(BaseCommand):
             help='Username to assign as the creator of these patients (default: admin)'
         )
 
-    def generate_unique_nric(self):
+    def generate_unique_nric(self, taken_nrics):
         """
-        Generates a unique NRIC that does not already exist in the database.
+        Generates an NRIC not in taken_nrics (pre-loaded from the database) and reserves it.
         """
         while True:
             # A simplified but plausible format for random NRICs
-            nric = f"T{random.randint(10, 99):02d}{random.randint(10000, 99999):05d}{random.choice('ABCDEFGHIZJ')}"
-            if not Patient.objects.filter(nric=nric).exists():
+            nric = f"T{''.join(random.choices(_NRIC_DIGITS, k=7))}{random.choice(_NRIC_SUFFIX)}"
+            if nric not in taken_nrics:
+                taken_nrics.add(nric)
                 return nric
 
     def generate_random_sg_phone(self):
@@ -78,32 +82,42 @@ class Command(BaseCommand):
         updated_count = 0
         
         with transaction.atomic():
+            # One query for the NRICs already present, used to report created vs updated
+            existing_nrics = set(Patient.objects.values_list('nric', flat=True))
+            # Generated NRICs must also avoid the ones supplied in the sample data
+            taken_nrics = existing_nrics | {d["NRIC/Passport No."] for d in sample_data if d["NRIC/Passport No."]}
+            
+            patients = []
             for patient_data in sample_data:
-                first_name = patient_data["First Name"]
-                last_name = patient_data["Last Name"]
-                
                 # Use existing NRIC or generate a new one
-                nric = patient_data["NRIC/Passport No."] or self.generate_unique_nric()
+                nric = patient_data["NRIC/Passport No."] or self.generate_unique_nric(taken_nrics)
                 
                 # Use existing contact number or generate a new one
                 contact_no = patient_data["Contact No."] or self.generate_random_sg_phone()
 
-                patient, created = Patient.objects.update_or_create(
+                patients.append(Patient(
+                    user=user,
+                    first_name=patient_data["First Name"],
+                    last_name=patient_data["Last Name"],
                     nric=nric,
-                    defaults={
-                        'user': user,
-                        'first_name': first_name,
-                        'last_name': last_name,
-                        'contact_no': contact_no,
-                    }
-                )
-                
-                if created:
-                    created_count += 1
-                    self.stdout.write(f'Created: {first_name} {last_name} ({nric})')
-                else:
-                    updated_count += 1
-                    self.stdout.write(f'Updated: {first_name} {last_name} ({nric})')
+                    contact_no=contact_no,
+                ))
+            
+            # Single INSERT ... ON CONFLICT (nric) DO UPDATE instead of a SELECT + write per row
+            Patient.objects.bulk_create(
+                patients,
+                update_conflicts=True,
+                unique_fields=['nric'],
+                update_fields=['user', 'first_name', 'last_name', 'contact_no'],
+            )
+            
+        for patient in patients:
+            if patient.nric in existing_nrics:
+                updated_count += 1
+                self.stdout.write(f'Updated: {patient.first_name} {patient.last_name} ({patient.nric})')
+            else:
+                created_count += 1
+                self.stdout.write(f'Created: {patient.first_name} {patient.last_name} ({patient.nric})')
 
         self.stdout.write(self.style.SUCCESS(
             f'\nSample data loading completed!\n'
@@ -1,6 +1,12 @@
 ﻿from django.db import models
 from django.contrib.auth.models import User
 
+
+def clean_folder_name(patient_name):
+    """Strip a patient name down to the characters allowed in media folder names"""
+    return "".join(c for c in patient_name if c.isalnum() or c in ['_', '-'])
+
+
 class Patient(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="new_patients")
     first_name = models.CharField(max_length=50)
@@ -10,5 +16,16 @@ class Patient(models.Model):
     contact_no = models.CharField(max_length=15, blank=True, null=True)
     details = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['last_name', 'first_name'], name='patient_name_idx'),
+            models.Index(fields=['user', 'last_name'], name='patient_user_last_name_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
+
+    @property
+    def folder_name(self):
+        """Media folder name for this patient's scans: first_last with special characters removed"""
+        return clean_folder_name(f"{self.first_name}_{self.last_name}")
@@ -1,10 +1,12 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
-from django.contrib.auth.models import User
 from django.db.models import QuerySet
+from django.http import Http404
+from apps.authentication.models import default_user_id, is_admin_user
 from .models import Patient
 from .serializers import PatientSerializer
 import logging
+from itertools import islice
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -15,57 +17,49 @@ class PatientViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):  # type: ignore[override]
         user = self.request.user
-        logger.debug(f"[PatientsAPI] Getting queryset for user: {user.username if user.is_authenticated else 'Anonymous'}")
+        logger.debug("[PatientsAPI] Getting queryset for user: %s", user.username if user.is_authenticated else 'Anonymous')
 
         # Allow AnonymousUser during testing
         if not user.is_authenticated:
             logger.info("[PatientsAPI] ⚠️  Anonymous user accessing patients - returning all patients for testing")
             # return Patient.objects.none()
             # Return all patients or a specific set for testing
-            queryset = Patient.objects.all()
-            logger.debug(f"[PatientsAPI] Returning {queryset.count()} patients for anonymous user")
-            return queryset
+            return Patient.objects.all()
 
-        # Handle authenticated users
-        try:
-            user_profile = getattr(user, 'new_userprofile', None)
-            if user_profile and user_profile.is_admin:
-                logger.info(f"[PatientsAPI] 👑 Admin user '{user.username}' accessing all patients")
-                queryset = Patient.objects.all()
-                logger.debug(f"[PatientsAPI] Admin user accessing {queryset.count()} total patients")
-                return queryset
-        except AttributeError:
-            # User doesn't have a profile, treat as regular user
-            pass
+        # Handle authenticated users; users without a profile are treated as regular users
+        if is_admin_user(user):
+            logger.info("[PatientsAPI] 👑 Admin user '%s' accessing all patients", user.username)
+            return Patient.objects.all()
         
-        logger.info(f"[PatientsAPI] 👤 Regular user '{user.username}' accessing their patients")
-        queryset = Patient.objects.filter(user=user)
-        logger.debug(f"[PatientsAPI] Regular user has access to {queryset.count()} patients")
-        return queryset
+        logger.info("[PatientsAPI] 👤 Regular user '%s' accessing their patients", user.username)
+        return Patient.objects.filter(user=user)
 
     def list(self, request, *args, **kwargs):
-        logger.info(f"[PatientsAPI] 📋 GET /patients/ - Fetching patients list")
-        logger.debug(f"[PatientsAPI] Request from IP: {request.META.get('REMOTE_ADDR', 'Unknown')}")
+        logger.info("[PatientsAPI] 📋 GET /patients/ - Fetching patients list")
+        logger.debug("[PatientsAPI] Request from IP: %s", request.META.get('REMOTE_ADDR', 'Unknown'))
         
         try:
             queryset = self.get_queryset()
             serializer = self.get_serializer(queryset, many=True)
-            patient_count = len(serializer.data)
+            # ListSerializer.data wraps a fresh ReturnList copy on every access; read it once
+            data = serializer.data
+            patient_count = len(data)
             
-            logger.info(f"[PatientsAPI] ✅ Successfully retrieved {patient_count} patients")
+            logger.info("[PatientsAPI] ✅ Successfully retrieved %s patients", patient_count)
             
             # Log patient names for debugging (first 5)
-            if patient_count > 0:
-                patient_names = [f"{p.get('first_name', '')} {p.get('last_name', '')}" for p in serializer.data[:5]]
-                names_preview = ", ".join(patient_names)
+            if patient_count > 0 and logger.isEnabledFor(logging.DEBUG):
+                names_preview = ", ".join(
+                    f"{p.get('first_name', '')} {p.get('last_name', '')}" for p in islice(data, 5)
+                )
                 if patient_count > 5:
                     names_preview += f"... and {patient_count - 5} more"
-                logger.debug(f"[PatientsAPI] Patients preview: {names_preview}")
+                logger.debug("[PatientsAPI] Patients preview: %s", names_preview)
             
-            return Response(serializer.data)
+            return Response(data)
             
         except Exception as e:
-            logger.error(f"[PatientsAPI] ❌ Error fetching patients list: {str(e)}")
+            logger.error("[PatientsAPI] ❌ Error fetching patients list: %s", e)
             return Response(
                 {'error': 'Failed to fetch patients'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -73,27 +67,26 @@ class PatientViewSet(viewsets.ModelViewSet):
 
     def retrieve(self, request, *args, **kwargs):
         patient_id = kwargs.get('pk')
-        logger.info(f"[PatientsAPI] 👤 GET /patients/{patient_id}/ - Fetching patient details")
-        logger.debug(f"[PatientsAPI] Request from IP: {request.META.get('REMOTE_ADDR', 'Unknown')}")
+        logger.info("[PatientsAPI] 👤 GET /patients/%s/ - Fetching patient details", patient_id)
+        logger.debug("[PatientsAPI] Request from IP: %s", request.META.get('REMOTE_ADDR', 'Unknown'))
         
         try:
             instance = self.get_object()
             serializer = self.get_serializer(instance)
             
-            patient_name = f"{instance.first_name} {instance.last_name}"
-            logger.info(f"[PatientsAPI] ✅ Successfully retrieved patient: {patient_name} (ID: {patient_id}, NRIC: {instance.nric})")
-            logger.debug(f"[PatientsAPI] Patient details - Contact: {instance.contact_no or 'None'}, DOB: {instance.date_of_birth or 'None'}")
+            logger.info("[PatientsAPI] ✅ Successfully retrieved patient: %s %s (ID: %s, NRIC: %s)", instance.first_name, instance.last_name, patient_id, instance.nric)
+            logger.debug("[PatientsAPI] Patient details - Contact: %s, DOB: %s", instance.contact_no or 'None', instance.date_of_birth or 'None')
             
             return Response(serializer.data)
             
-        except Patient.DoesNotExist:
-            logger.warning(f"[PatientsAPI] ⚠️  Patient with ID {patient_id} not found")
+        except Http404:
+            logger.warning("[PatientsAPI] ⚠️  Patient with ID %s not found", patient_id)
             return Response(
                 {'error': f'Patient with ID {patient_id} not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            logger.error(f"[PatientsAPI] ❌ Error fetching patient {patient_id}: {str(e)}")
+            logger.error("[PatientsAPI] ❌ Error fetching patient %s: %s", patient_id, e)
             return Response(
                 {'error': 'Failed to fetch patient details'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -101,21 +94,21 @@ class PatientViewSet(viewsets.ModelViewSet):
 
     def create(self, request, *args, **kwargs):
         logger.info("[PatientsAPI] 🆕 POST /patients/ - Creating new patient")
-        logger.debug(f"[PatientsAPI] Request data keys: {list(request.data.keys())}")
+        logger.debug("[PatientsAPI] Request data keys: %s", list(request.data.keys()))
         
         try:
             serializer = self.get_serializer(data=request.data)
             if serializer.is_valid():
                 self.perform_create(serializer)
-                patient_name = f"{serializer.data.get('first_name')} {serializer.data.get('last_name')}"
-                logger.info(f"[PatientsAPI] ✅ Successfully created patient: {patient_name} (ID: {serializer.data.get('id')})")
+                instance = serializer.instance
+                logger.info("[PatientsAPI] ✅ Successfully created patient: %s %s (ID: %s)", instance.first_name, instance.last_name, instance.pk)
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             else:
-                logger.warning(f"[PatientsAPI] ⚠️  Patient creation failed - Validation errors: {serializer.errors}")
+                logger.warning("[PatientsAPI] ⚠️  Patient creation failed - Validation errors: %s", serializer.errors)
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
-            logger.error(f"[PatientsAPI] ❌ Error creating patient: {str(e)}")
+            logger.error("[PatientsAPI] ❌ Error creating patient: %s", e)
             return Response(
                 {'error': 'Failed to create patient'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -123,35 +116,36 @@ class PatientViewSet(viewsets.ModelViewSet):
 
     def update(self, request, *args, **kwargs):
         patient_id = kwargs.get('pk')
-        logger.info(f"[PatientsAPI] ✏️  PUT /patients/{patient_id}/ - Updating patient")
-        logger.debug(f"[PatientsAPI] Update data keys: {list(request.data.keys())}")
+        partial = kwargs.pop('partial', False)
+        logger.info("[PatientsAPI] ✏️  %s /patients/%s/ - Updating patient", request.method, patient_id)
+        logger.debug("[PatientsAPI] Update data keys: %s", list(request.data.keys()))
         
         try:
             instance = self.get_object()
             old_name = f"{instance.first_name} {instance.last_name}"
             
-            serializer = self.get_serializer(instance, data=request.data)
+            serializer = self.get_serializer(instance, data=request.data, partial=partial)
             if serializer.is_valid():
-                serializer.save()
-                new_name = f"{serializer.data.get('first_name')} {serializer.data.get('last_name')}"
-                logger.info(f"[PatientsAPI] ✅ Successfully updated patient: {new_name} (ID: {patient_id})")
+                instance = serializer.save()
+                new_name = f"{instance.first_name} {instance.last_name}"
+                logger.info("[PatientsAPI] ✅ Successfully updated patient: %s (ID: %s)", new_name, patient_id)
                 
                 if old_name != new_name:
-                    logger.debug(f"[PatientsAPI] Patient name changed from '{old_name}' to '{new_name}'")
+                    logger.debug("[PatientsAPI] Patient name changed from '%s' to '%s'", old_name, new_name)
                 
                 return Response(serializer.data)
             else:
-                logger.warning(f"[PatientsAPI] ⚠️  Patient update failed - Validation errors: {serializer.errors}")
+                logger.warning("[PatientsAPI] ⚠️  Patient update failed - Validation errors: %s", serializer.errors)
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
                 
-        except Patient.DoesNotExist:
-            logger.warning(f"[PatientsAPI] ⚠️  Patient with ID {patient_id} not found for update")
+        except Http404:
+            logger.warning("[PatientsAPI] ⚠️  Patient with ID %s not found for update", patient_id)
             return Response(
                 {'error': f'Patient with ID {patient_id} not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            logger.error(f"[PatientsAPI] ❌ Error updating patient {patient_id}: {str(e)}")
+            logger.error("[PatientsAPI] ❌ Error updating patient %s: %s", patient_id, e)
             return Response(
                 {'error': 'Failed to update patient'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -159,24 +153,24 @@ class PatientViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         patient_id = kwargs.get('pk')
-        logger.info(f"[PatientsAPI] 🗑️  DELETE /patients/{patient_id}/ - Deleting patient")
+        logger.info("[PatientsAPI] 🗑️  DELETE /patients/%s/ - Deleting patient", patient_id)
         
         try:
             instance = self.get_object()
             patient_name = f"{instance.first_name} {instance.last_name}"
             
             self.perform_destroy(instance)
-            logger.info(f"[PatientsAPI] ✅ Successfully deleted patient: {patient_name} (ID: {patient_id})")
+            logger.info("[PatientsAPI] ✅ Successfully deleted patient: %s (ID: %s)", patient_name, patient_id)
             return Response(status=status.HTTP_204_NO_CONTENT)
             
-        except Patient.DoesNotExist:
-            logger.warning(f"[PatientsAPI] ⚠️  Patient with ID {patient_id} not found for deletion")
+        except Http404:
+            logger.warning("[PatientsAPI] ⚠️  Patient with ID %s not found for deletion", patient_id)
             return Response(
                 {'error': f'Patient with ID {patient_id} not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            logger.error(f"[PatientsAPI] ❌ Error deleting patient {patient_id}: {str(e)}")
+            logger.error("[PatientsAPI] ❌ Error deleting patient %s: %s", patient_id, e)
             return Response(
                 {'error': 'Failed to delete patient'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -187,8 +181,7 @@ class PatientViewSet(viewsets.ModelViewSet):
             logger.debug("[PatientsAPI] Creating patient for anonymous user - using default_user")
             # Using default user
             # Default user 'default_user' created with password 'default_password'.
-            default_user = User.objects.get(username="default_user") 
-            serializer.save(user=default_user)
+            serializer.save(user_id=default_user_id())
         else:
-            logger.debug(f"[PatientsAPI] Creating patient for authenticated user: {self.request.user.username}")
+            logger.debug("[PatientsAPI] Creating patient for authenticated user: %s", self.request.user.username)
             serializer.save(user=self.request.user)
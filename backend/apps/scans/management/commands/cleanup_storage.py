@@ -1,10 +1,67 @@
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.db import transaction
+from apps.patients.models import clean_folder_name
 from apps.scans.models import Scan, ScanResult
 
+# Rows per bulk_update when rewriting migrated file paths
+_MIGRATE_BATCH_SIZE = 500
+# IDs per IN (...) lookup when checking on-disk scan folders against the database
+_ID_LOOKUP_BATCH_SIZE = 500
+# Threads walking patient directories for the storage report
+_STATS_MAX_WORKERS = 16
+# Top-level media folders that are not patient directories
+_LEGACY_STORAGE_DIRS = frozenset(['scans', 'generated_stl', 'stl_previews', 'processed_scans', 'bbox_crop_results'])
+
+
+def _listed_exists(path, dir_listings):
+    """Whether path exists, answered from one cached scandir of its parent directory."""
+    listing = dir_listings.get(path.parent)
+    if listing is None:
+        try:
+            with os.scandir(path.parent) as entries:
+                listing = {entry.name for entry in entries}
+        except OSError:
+            listing = set()
+        dir_listings[path.parent] = listing
+    return path.name in listing
+
+
+def _dir_usage(path):
+    """Total size and count of the files under path, read from scandir entries."""
+    size = 0
+    files = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                sub_size, sub_files = _dir_usage(entry.path)
+                size += sub_size
+                files += sub_files
+            elif entry.is_file():
+                size += entry.stat().st_size
+                files += 1
+    return size, files
+
+
+def _scan_patient(patient_dir):
+    """(size, files, scans) for the scan_* folders of one patient directory."""
+    size = 0
+    files = 0
+    scans = 0
+    with os.scandir(patient_dir) as entries:
+        for entry in entries:
+            if entry.is_dir() and entry.name.startswith('scan_'):
+                scans += 1
+                scan_size, scan_files = _dir_usage(entry.path)
+                size += scan_size
+                files += scan_files
+    return size, files, scans
+
+
 class Command(BaseCommand):
     """
     Enhanced cleanup for patient-centric storage with optimization
@@ -85,18 +142,27 @@ class Command(BaseCommand):
         legacy_stl_dir = media_root / 'generated_stl'
         legacy_preview_dir = media_root / 'stl_previews'
         
-        # Get all scan results to update
-        scan_results = ScanResult.objects.select_related('scan__patient').all()
+        # Get all scan results to update; plain rows only carry the columns the migration reads
+        scan_results = ScanResult.objects.values(
+            'id', 'scan_id', 'scan__patient__first_name', 'scan__patient__last_name',
+            'stl_file', 'preview_image',
+        )
+        migrated = []
+        stale_files = []
+        dir_listings = {}
         
-        for scan_result in scan_results:
+        for row in scan_results.iterator(chunk_size=_MIGRATE_BATCH_SIZE):
             try:
-                scan = scan_result.scan
-                patient = scan.patient
+                scan_id = row['scan_id']
+                stl_name = row['stl_file']
+                preview_name = row['preview_image']
+                row_stale_files = []
                 
                 # Create patient directory structure
-                patient_name = f"{patient.first_name}_{patient.last_name}"
-                clean_patient_name = "".join(c for c in patient_name if c.isalnum() or c in ['_', '-'])
-                patient_scan_dir = media_root / clean_patient_name / f"scan_{scan.id}"
+                clean_patient_name = clean_folder_name(
+                    f"{row['scan__patient__first_name']}_{row['scan__patient__last_name']}"
+                )
+                patient_scan_dir = media_root / clean_patient_name / f"scan_{scan_id}"
                 
                 if dry_run:
                     self.stdout.write(f"[DRY RUN] Would create: {patient_scan_dir}")
@@ -104,39 +170,69 @@ class Command(BaseCommand):
                     patient_scan_dir.mkdir(parents=True, exist_ok=True)
                 
                 # Migrate STL file if it exists
-                if scan_result.stl_file and scan_result.stl_file.name:
-                    old_stl_path = media_root / scan_result.stl_file.name
-                    if old_stl_path.exists():
-                        new_stl_filename = f"{scan.id}.stl"
+                if stl_name:
+                    old_stl_path = media_root / stl_name
+                    if _listed_exists(old_stl_path, dir_listings):
+                        new_stl_filename = f"{scan_id}.stl"
                         new_stl_path = patient_scan_dir / new_stl_filename
                         
                         if dry_run:
                             self.stdout.write(f"[DRY RUN] Would move: {old_stl_path} -> {new_stl_path}")
-                        else:
-                            shutil.copy2(old_stl_path, new_stl_path)
-                            scan_result.stl_file.name = f"{clean_patient_name}/scan_{scan.id}/{new_stl_filename}"
+                        elif old_stl_path != new_stl_path:
+                            self._link_file(old_stl_path, new_stl_path)
+                            row_stale_files.append(old_stl_path)
+                            stl_name = f"{clean_patient_name}/scan_{scan_id}/{new_stl_filename}"
                             self.stdout.write(f"Migrated STL: {new_stl_path}")
                 
                 # Migrate preview if it exists
-                if scan_result.preview_image and scan_result.preview_image.name:
-                    old_preview_path = media_root / scan_result.preview_image.name
-                    if old_preview_path.exists():
-                        new_preview_filename = f"{scan.id}_preview.png"
+                if preview_name:
+                    old_preview_path = media_root / preview_name
+                    if _listed_exists(old_preview_path, dir_listings):
+                        new_preview_filename = f"{scan_id}_preview.png"
                         new_preview_path = patient_scan_dir / new_preview_filename
                         
                         if dry_run:
                             self.stdout.write(f"[DRY RUN] Would move: {old_preview_path} -> {new_preview_path}")
-                        else:
-                            shutil.copy2(old_preview_path, new_preview_path)
-                            scan_result.preview_image.name = f"{clean_patient_name}/scan_{scan.id}/{new_preview_filename}"
+                        elif old_preview_path != new_preview_path:
+                            self._link_file(old_preview_path, new_preview_path)
+                            row_stale_files.append(old_preview_path)
+                            preview_name = f"{clean_patient_name}/scan_{scan_id}/{new_preview_filename}"
                             self.stdout.write(f"Migrated preview: {new_preview_path}")
                 
-                # Save updated paths
-                if not dry_run:
-                    scan_result.save()
+                # Queue updated paths on pk-only instances; old files are only removed once their rows commit
+                if row_stale_files:
+                    migrated.append(ScanResult(id=row['id'], stl_file=stl_name, preview_image=preview_name))
+                    stale_files.extend(row_stale_files)
+                    if len(migrated) >= _MIGRATE_BATCH_SIZE:
+                        self._save_migrated(migrated, stale_files)
                     
             except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Error migrating scan {scan_result.id}: {e}"))
+                self.stdout.write(self.style.ERROR(f"Error migrating scan {row['id']}: {e}"))
+        
+        self._save_migrated(migrated, stale_files)
+
+    def _link_file(self, old_path, new_path):
+        """Hard-link old_path at new_path (no data copy); copy when linking isn't possible."""
+        try:
+            os.link(old_path, new_path)
+        except FileExistsError:
+            # Left over from an interrupted run; replace it with the current file
+            os.unlink(new_path)
+            os.link(old_path, new_path)
+        except OSError:
+            # Cross-device (EXDEV) or a filesystem without hard links
+            shutil.copy2(old_path, new_path)
+
+    def _save_migrated(self, migrated, stale_files):
+        """Write queued path changes with one UPDATE batch, then remove the superseded files."""
+        if not migrated:
+            return
+        with transaction.atomic():
+            ScanResult.objects.bulk_update(migrated, ['stl_file', 'preview_image'], batch_size=_MIGRATE_BATCH_SIZE)
+        for old_path in stale_files:
+            old_path.unlink(missing_ok=True)
+        migrated.clear()
+        stale_files.clear()
 
     def _cleanup_orphaned_files(self, media_root, dry_run):
         """Clean up orphaned files for non-existent scans"""
@@ -144,9 +240,8 @@ class Command(BaseCommand):
         self.stdout.write("CLEANING ORPHANED FILES")
         self.stdout.write("="*50)
         
-        existing_scan_ids = set(Scan.objects.values_list('id', flat=True))
-        
-        # Check patient directories for orphaned scan folders
+        # Collect scan folders on disk first, then look up only those IDs
+        scan_dirs = {}
         for patient_dir in media_root.iterdir():
             if patient_dir.is_dir() and not patient_dir.name.startswith('.'):
                 # Skip system directories
@@ -158,16 +253,27 @@ class Command(BaseCommand):
                     if scan_dir.is_dir() and scan_dir.name.startswith('scan_'):
                         try:
                             scan_id = int(scan_dir.name.replace('scan_', ''))
-                            if scan_id not in existing_scan_ids:
-                                self.stdout.write(f"Found orphaned scan directory: {scan_dir}")
-                                if dry_run:
-                                    self.stdout.write(self.style.WARNING(f"[DRY RUN] Would delete: {scan_dir}"))
-                                else:
-                                    shutil.rmtree(scan_dir)
-                                    self.stdout.write(self.style.SUCCESS(f"Deleted orphaned directory: {scan_dir}"))
                         except ValueError:
                             # Skip directories that don't follow scan_X pattern
                             continue
+                        scan_dirs.setdefault(scan_id, []).append(scan_dir)
+        
+        found_scan_ids = list(scan_dirs)
+        existing_scan_ids = set()
+        for i in range(0, len(found_scan_ids), _ID_LOOKUP_BATCH_SIZE):
+            batch = found_scan_ids[i:i + _ID_LOOKUP_BATCH_SIZE]
+            existing_scan_ids.update(Scan.objects.filter(id__in=batch).values_list('id', flat=True))
+        
+        for scan_id in found_scan_ids:
+            if scan_id in existing_scan_ids:
+                continue
+            for scan_dir in scan_dirs[scan_id]:
+                self.stdout.write(f"Found orphaned scan directory: {scan_dir}")
+                if dry_run:
+                    self.stdout.write(self.style.WARNING(f"[DRY RUN] Would delete: {scan_dir}"))
+                else:
+                    shutil.rmtree(scan_dir)
+                    self.stdout.write(self.style.SUCCESS(f"Deleted orphaned directory: {scan_dir}"))
 
     def _report_storage_stats(self, media_root):
         """Report storage statistics for new structure"""
@@ -175,38 +281,25 @@ class Command(BaseCommand):
         self.stdout.write("STORAGE STATISTICS (PATIENT-CENTRIC)")
         self.stdout.write("="*50)
         
-        total_size = 0
-        total_files = 0
-        patient_count = 0
-        scan_count = 0
+        # Skip legacy system directories before dispatching any work
+        patient_dirs = [
+            patient_dir for patient_dir in media_root.iterdir()
+            if patient_dir.is_dir() and not patient_dir.name.startswith('.')
+            and patient_dir.name not in _LEGACY_STORAGE_DIRS
+        ]
         
-        # Count patient directories and their contents
-        for patient_dir in media_root.iterdir():
-            if patient_dir.is_dir() and not patient_dir.name.startswith('.'):
-                # Skip legacy system directories
-                if patient_dir.name in ['scans', 'generated_stl', 'stl_previews', 'processed_scans', 'bbox_crop_results']:
-                    continue
-                
-                patient_count += 1
-                patient_size = 0
-                patient_files = 0
-                patient_scans = 0
-                
-                for scan_dir in patient_dir.iterdir():
-                    if scan_dir.is_dir() and scan_dir.name.startswith('scan_'):
-                        patient_scans += 1
-                        scan_count += 1
-                        
-                        for file_path in scan_dir.rglob('*'):
-                            if file_path.is_file():
-                                size = file_path.stat().st_size
-                                patient_size += size
-                                total_size += size
-                                patient_files += 1
-                                total_files += 1
-                
-                if patient_files > 0:
-                    self.stdout.write(f"{patient_dir.name:30}: {patient_size:>10} bytes ({patient_files} files, {patient_scans} scans)")
+        # Walk patient directories concurrently; map() keeps the report in directory order
+        with ThreadPoolExecutor(max_workers=_STATS_MAX_WORKERS) as executor:
+            patient_stats = list(executor.map(_scan_patient, patient_dirs))
+        
+        for patient_dir, (patient_size, patient_files, patient_scans) in zip(patient_dirs, patient_stats):
+            if patient_files > 0:
+                self.stdout.write(f"{patient_dir.name:30}: {patient_size:>10} bytes ({patient_files} files, {patient_scans} scans)")
+        
+        patient_count = len(patient_dirs)
+        total_size = sum(stats[0] for stats in patient_stats)
+        total_files = sum(stats[1] for stats in patient_stats)
+        scan_count = sum(stats[2] for stats in patient_stats)
         
         self.stdout.write("-" * 70)
         self.stdout.write(f"{'TOTAL PATIENTS':30}: {patient_count}")
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("scans", "0005_make_session_id_unique"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="scan",
+            index=models.Index(
+                fields=["user", "-created_at"], name="scan_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scan",
+            index=models.Index(
+                fields=["patient", "-created_at"], name="scan_patient_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scan",
+            index=models.Index(fields=["-created_at"], name="scan_created_idx"),
+        ),
+    ]
@@ -1,7 +1,10 @@
 ﻿from django.db import models
+from django.conf import settings
 from django.contrib.auth.models import User
 from apps.patients.models import Patient
+from functools import cached_property
 import os
+import shutil
 import uuid
 
 class Scan(models.Model):
@@ -13,27 +16,38 @@ class Scan(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_processed = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Scan lists are filtered by user or patient and ordered newest first
+            models.Index(fields=['user', '-created_at'], name='scan_user_created_idx'),
+            models.Index(fields=['patient', '-created_at'], name='scan_patient_created_idx'),
+            models.Index(fields=['-created_at'], name='scan_created_idx'),
+        ]
+
     def __str__(self):
         return f"Processing session for {self.patient} by {self.user.username} on {self.created_at}"
     
-    def get_session_dir(self):
+    @cached_property
+    def session_dir(self):
         """Get the temporary session directory for this scan"""
-        from django.conf import settings
-        import os
         return os.path.join(settings.MEDIA_ROOT, 'temp', 'sessions', str(self.session_id))
     
     def cleanup_session(self):
         """Clean up temporary session files"""
-        import shutil
-        import os
-        session_dir = self.get_session_dir()
-        if os.path.exists(session_dir):
+        session_dir = self.session_dir
+        try:
             shutil.rmtree(session_dir)
-            print(f"🧹 Cleaned up session directory: {session_dir}")
+        except FileNotFoundError:
+            return
+        print(f"🧹 Cleaned up session directory: {session_dir}")
     
     @property
     def scan_attempt_number(self):
         """Get the scan attempt number for this patient"""
+        # Precomputed by ScanViewSet.get_queryset; fall back to a COUNT for standalone instances
+        attempt_number = getattr(self, 'attempt_number', None)
+        if attempt_number is not None:
+            return attempt_number
         if self.patient:
             return self.patient.new_scans.filter(
                 created_at__lte=self.created_at
@@ -44,14 +58,7 @@ class Scan(models.Model):
 def patient_scan_upload_to(instance, filename):
     """Generate upload path based on patient name and scan number: patient_name/scan_number/filename"""
     if instance.scan and instance.scan.patient:
-        patient_name = f"{instance.scan.patient.first_name}_{instance.scan.patient.last_name}"
-        # Remove special characters from patient name
-        patient_name = "".join(c for c in patient_name if c.isalnum() or c in ['_', '-'])
-        
-        # Get scan attempt number for this patient  
-        patient_scan_count = instance.scan.patient.new_scans.filter(
-            created_at__lte=instance.scan.created_at
-        ).count()
+        patient_name = instance.scan.patient.folder_name
         
         # Return path: /media/patient_name/scan_number/filename
         return f"{patient_name}/scan_{instance.scan.id}/{filename}"
@@ -77,22 +84,20 @@ class ScanResult(models.Model):
         return f"Results for Scan #{self.scan.id} - {self.scan.patient}"
     
     def save(self, *args, **kwargs):
-        """Auto-populate patient_name field when saving"""
-        if self.scan and self.scan.patient and not self.patient_name:
-            self.patient_name = f"{self.scan.patient.first_name}_{self.scan.patient.last_name}"
-            # Remove special characters from patient name
-            self.patient_name = "".join(c for c in self.patient_name if c.isalnum() or c in ['_', '-'])
+        """Auto-populate patient_name field on insert"""
+        # Cheap checks first so updates never touch the scan/patient relations
+        if not self.patient_name and self._state.adding and self.scan and self.scan.patient:
+            self.patient_name = self.scan.patient.folder_name
         super().save(*args, **kwargs)
     
-    @property
+    @cached_property
     def patient_folder(self):
         """Get the patient folder name"""
         if self.scan and self.scan.patient:
-            patient_name = f"{self.scan.patient.first_name}_{self.scan.patient.last_name}"
-            return "".join(c for c in patient_name if c.isalnum() or c in ['_', '-'])
+            return self.scan.patient.folder_name
         return "unknown"
     
-    @property 
+    @cached_property
     def scan_folder(self):
         """Get the scan folder name"""
         return f"scan_{self.scan.id}" if self.scan else "scan_unknown"
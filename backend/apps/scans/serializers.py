@@ -1,6 +1,31 @@
+import os
 from rest_framework import serializers
 from .models import Scan, ScanResult
 
+_FILE_FIELDS = ('stl_file', 'depth_map_8bit', 'depth_map_16bit', 'preview_image')
+
+
+def _listed_size(field, dir_listings):
+    """Size of a stored file from a single scandir of its folder, or None if it can't be listed"""
+    try:
+        path = field.storage.path(field.name)
+    except NotImplementedError:
+        # Remote storage backends have no local path to scan
+        return None
+    directory, filename = os.path.split(path)
+    listing = dir_listings.get(directory)
+    if listing is None:
+        listing = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        listing[entry.name] = entry.stat().st_size
+        except OSError:
+            pass
+        dir_listings[directory] = listing
+    return listing.get(filename)
+
 class ScanResultSerializer(serializers.ModelSerializer):
     scan_id = serializers.ReadOnlyField(source='scan.id')
     # Use the database patient_name field if available, fallback to computed name
@@ -38,12 +63,15 @@ class ScanResultSerializer(serializers.ModelSerializer):
         logger = logging.getLogger(__name__)
         
         sizes = {}
-        for field_name in ['stl_file', 'depth_map_8bit', 'depth_map_16bit', 'preview_image']:
+        dir_listings = {}
+        for field_name in _FILE_FIELDS:
             field = getattr(obj, field_name)
             if field and field.name:  # Check if field has a name (file path)
                 try:
-                    # Try to access the file size
-                    file_size = field.size
+                    # Files of one scan share a folder: list each folder once instead of stat-ing every file
+                    file_size = _listed_size(field, dir_listings)
+                    if file_size is None:
+                        file_size = field.size
                     sizes[field_name] = round(file_size / (1024 * 1024), 2)  # Convert to MB
                 except (OSError, IOError, FileNotFoundError) as e:
                     # File doesn't exist on disk, set size as 0
@@ -84,8 +112,6 @@ class ScanSerializer(serializers.ModelSerializer):
     
     def get_has_results(self, obj):
         """Check if scan has results with actual STL file"""
-        try:
-            result = obj.result
-            return bool(result.stl_file and result.stl_file.name)
-        except:
-            return False
+        # Missing reverse one-to-one raises RelatedObjectDoesNotExist (an AttributeError)
+        result = getattr(obj, 'result', None)
+        return bool(result and result.stl_file and result.stl_file.name)
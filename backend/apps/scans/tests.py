@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+
+from apps.authentication.models import UserProfile
+from apps.patients.models import Patient
+from .models import Scan, ScanResult
+
+
+class ScanVisibilityTests(APITestCase):
+    """Regular users list only their own scans and results; admins list every user's."""
+
+    def setUp(self):
+        # No passwords, since force_authenticate never checks one
+        self.user = User.objects.create_user(username='clinician')
+        UserProfile.objects.create(user=self.user, is_admin=False)
+        self.admin = User.objects.create_user(username='admin')
+        UserProfile.objects.create(user=self.admin, is_admin=True)
+
+        self.own_scan = self._create_scan(self.user, 'S1234567D')
+        self.other_scan = self._create_scan(self.admin, 'S7654321A')
+
+    def _create_scan(self, user, nric):
+        patient = Patient.objects.create(user=user, first_name='Test', last_name=user.username, nric=nric)
+        scan = Scan.objects.create(user=user, patient=patient)
+        ScanResult.objects.create(scan=scan)
+        return scan
+
+    def _listed_ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] for row in response.data['results']}
+
+    def test_regular_user_lists_own_scans(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self._listed_ids('/api/scans/'), {self.own_scan.id})
+
+    def test_admin_lists_all_scans(self):
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self._listed_ids('/api/scans/'), {self.own_scan.id, self.other_scan.id})
+
+    def test_regular_user_lists_own_scan_results(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self._listed_ids('/api/scan-results/'), {self.own_scan.result.id})
+
+    def test_admin_lists_all_scan_results(self):
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(
+            self._listed_ids('/api/scan-results/'),
+            {self.own_scan.result.id, self.other_scan.result.id},
+        )
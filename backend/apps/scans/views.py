@@ -3,30 +3,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.contrib.auth.models import User
-from apps.patients.models import Patient
+from django.db.models import Count, OuterRef, Subquery
+from apps.authentication.models import default_user_id, is_admin_user
+from apps.common.pagination import StandardLimitOffsetPagination
+from apps.ai_processing.session_manager import SessionManager
 from .models import Scan, ScanResult
 from .serializers import ScanSerializer, ScanResultSerializer
-import numpy as np
+import logging
 
-
-def convert_numpy_types(obj):
-    """
-    Recursively convert NumPy types to native Python types for JSON serialization.
-    """
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_numpy_types(item) for item in obj)
-    else:
-        return obj
+logger = logging.getLogger(__name__)
 
 
 class ScanViewSet(viewsets.ModelViewSet):
@@ -38,43 +23,55 @@ class ScanViewSet(viewsets.ModelViewSet):
     """
     serializer_class = ScanSerializer
     # permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardLimitOffsetPagination
     parser_classes = (MultiPartParser, FormParser, JSONParser)
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Scan.objects.all()
-
-        # Allow AnonymousUser during testing
-        if not user.is_authenticated:
-            queryset = Scan.objects.all()
-        # Handle authenticated users
-        elif hasattr(user, 'userprofile') and user.userprofile.is_admin:
-            queryset = Scan.objects.all()  # Admin users see all scans
-        else:
+        # Regular users see their own scans; admins (and AnonymousUser, allowed during testing) see all
+        if user.is_authenticated and not is_admin_user(user):
             queryset = Scan.objects.filter(user=user)
+        else:
+            queryset = Scan.objects.all()
         
         # Filter by patient if patient parameter is provided
         patient_id = self.request.query_params.get('patient', None)
         if patient_id is not None:
             queryset = queryset.filter(patient_id=patient_id)
         
-        # Order by created_at descending (newest first)
-        return queryset.order_by('-created_at') 
+        # Compute every row's scan_attempt_number in the same query instead of a COUNT per row;
+        # counts all of the patient's scans, not just the ones visible in this queryset
+        attempts = (
+            Scan.objects.filter(patient_id=OuterRef('patient_id'), created_at__lte=OuterRef('created_at'))
+            .order_by()
+            .values('patient_id')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        queryset = queryset.annotate(attempt_number=Subquery(attempts))
+        
+        # Order by created_at descending (newest first); join the serialized relations
+        # (nested result, patient name, username) instead of querying them per row.
+        # The free-text patient details are never serialized here, so leave them out of the join.
+        return (
+            queryset.select_related('result', 'patient', 'user')
+            .defer('patient__details')
+            .order_by('-created_at')
+        )
     
     def perform_create(self, serializer):
         if self.request.user.is_anonymous:
             # Using default user for anonymous uploads
             # Default user 'default_user' created with password 'default_password'.
             try:
-                default_user = User.objects.get(username="default_user") 
-                serializer.save(user=default_user)
-                print(f"👤 [Backend] Using default_user for anonymous upload")
+                serializer.save(user_id=default_user_id())
+                logger.debug("[ScansAPI] Using default_user for anonymous upload")
             except User.DoesNotExist:
-                print(f"❌ [Backend] Error: default_user not found in database")
+                logger.error("[ScansAPI] ❌ default_user not found in database")
                 raise ValueError("Default user not found. Please contact administrator.")
         else:
             serializer.save(user=self.request.user)
-            print(f"👤 [Backend] Using authenticated user: {self.request.user.username}")
+            logger.debug("[ScansAPI] Using authenticated user: %s", self.request.user.username)
     
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def upload_image(self, request):
@@ -88,95 +85,67 @@ class ScanViewSet(viewsets.ModelViewSet):
         - /api/ai-processing/{scan_id}/process_depth_analysis/
         - /api/ai-processing/{scan_id}/process_mesh_generation/
         """
-        print(f"🚀 [Backend] Step 1: Starting image upload process...")
-        print(f"📥 [Backend] Request method: {request.method}")
-        print(f"📋 [Backend] Request data keys: {list(request.data.keys())}")
+        logger.info("[ScansAPI] 🚀 POST /scans/upload_image/ - Starting image upload")
+        logger.debug("[ScansAPI] Request data keys: %s", list(request.data.keys()))
         
         try:
             patient_id = request.data.get('patient')
-            print(f"👤 [Backend] Patient ID from request: {patient_id}")
             
             if not patient_id:
-                print(f"❌ [Backend] Error: Patient ID is required")
+                logger.warning("[ScansAPI] ⚠️  Upload rejected - Patient ID is required")
                 return Response({'error': 'Patient ID is required'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Check if patient exists
-            print(f"🔍 [Backend] Checking if patient exists...")
-            try:
-                patient = Patient.objects.get(id=patient_id)
-                print(f"✅ [Backend] Patient found: {patient}")
-            except Patient.DoesNotExist:
-                print(f"❌ [Backend] Error: Patient not found with ID {patient_id}")
-                return Response({'error': 'Patient not found'}, status=status.HTTP_404_NOT_FOUND)
+            # Create the lightweight scan (processing session); the serializer's patient
+            # field checks the patient exists, so there's no separate lookup
+            scan_data = {
+                'patient': patient_id,
+                # No image field - handled temporarily in session
+            }
+            serializer = self.get_serializer(data=scan_data)
+            if not serializer.is_valid():
+                patient_errors = serializer.errors.get('patient', [])
+                if any(getattr(error, 'code', None) == 'does_not_exist' for error in patient_errors):
+                    logger.warning("[ScansAPI] ⚠️  Upload rejected - Patient not found with ID %s", patient_id)
+                    return Response({'error': 'Patient not found'}, status=status.HTTP_404_NOT_FOUND)
+                logger.warning("[ScansAPI] ⚠️  Scan validation failed: %s", serializer.errors)
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
             
             # Get the image from the request
             image = request.data.get('image')
-            print(f"📷 [Backend] Image from request: {type(image)}")
             
             if not image:
-                print(f"❌ [Backend] Error: Image is required")
+                logger.warning("[ScansAPI] ⚠️  Upload rejected - Image is required")
                 return Response({'error': 'Image is required'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Log image details for debugging
-            print(f"📊 [Backend] Image details:")
-            print(f"  - Type: {type(image)}")
-            print(f"  - Size: {image.size} bytes")
-            print(f"  - Name: {image.name}")
-            print(f"  - Content type: {image.content_type}")
+            logger.debug(
+                "[ScansAPI] Image for patient %s: name=%s, size=%s bytes, content type=%s",
+                patient_id, image.name, image.size, image.content_type,
+            )
             
-            # Store image temporarily and create lightweight processing session
-            import os
-            from django.conf import settings
-            from apps.ai_processing.session_manager import SessionManager
-
-            # Create the lightweight scan (processing session) first
-            scan_data = {
-                'patient': patient_id,
-                # No image field - handled temporarily in session
-            }
-            print(f"📦 [Backend] Creating lightweight processing session:")
-            print(f"  - Patient: {patient_id}")
+            self.perform_create(serializer)  # Use perform_create to handle anonymous users
             
-            # Validate and save the scan
-            print(f"⚙️ [Backend] Validating scan data...")
-            serializer = self.get_serializer(data=scan_data)
-            if serializer.is_valid():
-                print(f"✅ [Backend] Scan data validation successful")
-                print(f"💾 [Backend] Saving processing session to database...")
-                self.perform_create(serializer)  # Use perform_create to handle anonymous users
-                
-                scan_id = serializer.data.get('id')
-                session_id = serializer.data.get('session_id')
-                print(f"✅ [Backend] Processing session created successfully!")
-                print(f"🆔 [Backend] Generated scan ID: {scan_id}")
-                print(f"🔑 [Backend] Generated session ID: {session_id}")
-                
-                # Initialize session manager and save image to session directory
-                session = SessionManager.get_session(session_id)
-                
-                # Save original image directly to session using SessionManager
-                original_image_path = session.save_original_image(image)
-                
-                print(f"📁 [Backend] Stored image in session directory: {original_image_path}")
-                print(f"📤 [Backend] Returning scan data to frontend")
-                
-                # Return scan data with session information for processing
-                response_data = serializer.data.copy()
-                response_data['temp_image_path'] = original_image_path
-                response_data['session_directory'] = session.session_dir
-                response_data['message'] = 'Processing session created. Image stored in session directory for AI processing.'
-                
-                return Response(response_data, status=status.HTTP_201_CREATED)
-            else:
-                print(f"❌ [Backend] Validation errors: {serializer.errors}")
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            scan_id = serializer.data.get('id')
+            session_id = serializer.data.get('session_id')
+            
+            # Initialize session manager and save image to session directory
+            session = SessionManager.get_session(session_id)
+            
+            # Save original image directly to session using SessionManager
+            original_image_path = session.save_original_image(image)
+            
+            logger.info("[ScansAPI] ✅ Created processing session for scan %s (session %s)", scan_id, session_id)
+            logger.debug("[ScansAPI] Stored image in session directory: %s", original_image_path)
+            
+            # Return scan data with session information for processing
+            response_data = serializer.data.copy()
+            response_data['temp_image_path'] = original_image_path
+            response_data['session_directory'] = session.session_dir
+            response_data['message'] = 'Processing session created. Image stored in session directory for AI processing.'
+            
+            return Response(response_data, status=status.HTTP_201_CREATED)
         
         except Exception as e:
-            print(f"❌ [Backend] Error in image upload process:")
-            print(f"❌ [Backend] Error message: {str(e)}")
-            import traceback
-            print(f"❌ [Backend] Traceback:")
-            print(traceback.format_exc())
+            logger.exception("[ScansAPI] ❌ Error in image upload process: %s", e)
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
@@ -184,26 +153,33 @@ class ScanResultViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing scan results"""
     serializer_class = ScanResultSerializer
     # permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardLimitOffsetPagination
     
     def get_queryset(self):
         user = self.request.user
-        queryset = ScanResult.objects.all()
-        
-        # Allow AnonymousUser during testing
-        if not user.is_authenticated:
-            queryset = ScanResult.objects.all()
-        elif hasattr(user, 'userprofile') and user.userprofile.is_admin:
-            queryset = ScanResult.objects.all()
-        else:
+        # Regular users see their own results; admins (and AnonymousUser, allowed during testing) see all
+        if user.is_authenticated and not is_admin_user(user):
             queryset = ScanResult.objects.filter(scan__user=user)
+        else:
+            queryset = ScanResult.objects.all()
         
         # Filter by patient if patient parameter is provided
         patient_id = self.request.query_params.get('patient', None)
         if patient_id is not None:
             queryset = queryset.filter(scan__patient_id=patient_id)
         
-        # Order by created_at descending (newest first)
-        return queryset.order_by('-created_at')
+        # Order by created_at descending (newest first).
+        # Load only what ScanResultSerializer reads: every result column, but just the
+        # scan date and patient name from the joined rows
+        return (
+            queryset.select_related('scan__patient')
+            .only(
+                'patient_name', 'stl_file', 'depth_map_8bit', 'depth_map_16bit', 'preview_image',
+                'volume_estimate', 'processing_metadata', 'created_at', 'updated_at',
+                'scan__created_at', 'scan__patient__first_name', 'scan__patient__last_name',
+            )
+            .order_by('-created_at')
+        )
 
 
 # ================================================================
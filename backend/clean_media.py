@@ -19,8 +19,33 @@ import sys
 import argparse
 import shutil
 from pathlib import Path
-from typing import List, Set
-
+from concurrent.futures import ThreadPoolExecutor
+from typing import FrozenSet, List, Optional, Set, Tuple
+
+# File extensions that should be cleaned
+_CLEAN_EXTENSIONS = frozenset({
+    # Image files
+    '.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.gif',
+    # Data files
+    '.json',
+    # 3D model files
+    '.stl', '.obj', '.ply',
+    # Other potential files
+    '.txt'  # But we'll exclude info.txt specifically
+})
+
+# Print a progress line after this many deletions
+_DELETE_PROGRESS_EVERY = 1000
+
+# Default number of concurrent deletions (--jobs)
+_DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files that are never deleted
+_PRESERVE_NAMES = frozenset({
+    'info.txt',  # Keep the info file
+    '.gitkeep',  # Keep git directory markers
+    'README.md', # Keep any readme files
+})
 
 def get_media_directory() -> Path:
     """Get the media directory path relative to the script location."""
@@ -34,152 +59,118 @@ def get_media_directory() -> Path:
     return media_dir
 
 
-def get_file_extensions_to_clean() -> Set[str]:
+def get_file_extensions_to_clean() -> FrozenSet[str]:
     """Get the file extensions that should be cleaned."""
-    return {
-        # Image files
-        '.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.gif',
-        # Data files
-        '.json',
-        # 3D model files
-        '.stl', '.obj', '.ply',
-        # Other potential files
-        '.txt'  # But we'll exclude info.txt specifically
-    }
+    return _CLEAN_EXTENSIONS
 
 
 def should_preserve_file(file_path: Path) -> bool:
     """Check if a file should be preserved (not deleted)."""
-    preserve_files = {
-        'info.txt',  # Keep the info file
-        '.gitkeep',  # Keep git directory markers
-        'README.md', # Keep any readme files
-    }
+    return file_path.name in _PRESERVE_NAMES
+
+
+def _scan_tree(root: str, extensions: Set[str], files: list, subtrees: list, is_root: bool = False) -> bool:
+    """
+    Append (path, size) for files under root matching extensions, using scandir entries.
+    Returns whether everything under root is deletable; the topmost such directories
+    below a non-deletable one are appended to subtrees.
+    """
+    deletable = True
+    deletable_children = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if _scan_tree(entry.path, extensions, files, subtrees):
+                        deletable_children.append(entry.path)
+                    else:
+                        deletable = False
+                elif entry.is_file():
+                    name = entry.name
+                    if os.path.splitext(name)[1].lower() in extensions and name not in _PRESERVE_NAMES:
+                        try:
+                            size = entry.stat().st_size
+                        except OSError:
+                            size = 0  # File might not exist or be accessible
+                        files.append((entry.path, size))
+                    else:
+                        deletable = False
+                else:
+                    deletable = False  # Symlinked directories and other special entries are kept
+    except OSError:
+        return False  # Unreadable directory; os.walk skipped these too
     
-    return file_path.name in preserve_files
+    # The media root itself is never removed, so its deletable children become subtrees
+    if not deletable or is_root:
+        subtrees.extend(deletable_children)
+    return deletable
 
 
-def find_files_to_clean(media_dir: Path, extensions: Set[str]) -> List[Path]:
-    """Find all files that should be cleaned based on extensions."""
-    files_to_clean = []
-    
-    for root, dirs, files in os.walk(media_dir):
-        root_path = Path(root)
-        
-        for file in files:
-            file_path = root_path / file
-            file_ext = file_path.suffix.lower()
-            
-            # Check if file should be cleaned
-            if file_ext in extensions and not should_preserve_file(file_path):
-                files_to_clean.append(file_path)
-    
-    return files_to_clean
+def find_files_to_clean(media_dir: Path, extensions: Set[str], subtrees: Optional[List[Path]] = None) -> List[Tuple[Path, int]]:
+    """
+    Find all files that should be cleaned based on extensions, with their sizes in bytes.
+    If subtrees is given, directories whose whole contents are deletable are appended to it.
+    """
+    files = []
+    subtree_paths = []
+    _scan_tree(str(media_dir), extensions, files, subtree_paths, is_root=True)
+    if subtrees is not None:
+        subtrees.extend(Path(path) for path in subtree_paths)
+    return [(Path(file_path), size) for file_path, size in files]
 
 
 def find_empty_directories(media_dir: Path) -> List[Path]:
     """Find empty directories that can be removed (excluding the root media dir)."""
     empty_dirs = []
+    # Whether each visited directory's subtree holds any non-preserved file
+    has_content = {}
     
-    # Walk from bottom up to catch nested empty directories
+    # Walk from bottom up so every subdirectory is resolved before its parent
     for root, dirs, files in os.walk(media_dir, topdown=False):
-        root_path = Path(root)
+        root_has_content = (
+            any(name not in _PRESERVE_NAMES for name in files)
+            or any(has_content.get(os.path.join(root, name), False) for name in dirs)
+        )
+        has_content[root] = root_has_content
         
         # Skip the root media directory itself
-        if root_path == media_dir:
-            continue
-            
-        # Check if directory is empty (no files and no subdirectories, or only empty subdirectories)
-        try:
-            # Check if directory has any content
-            has_content = False
-            for item in root_path.iterdir():
-                if item.is_file():
-                    # Check if this file should be preserved
-                    if not should_preserve_file(item):
-                        has_content = True
-                        break
-                elif item.is_dir():
-                    # Check if subdirectory has any content (recursively)
-                    if any(item.rglob('*')):
-                        # Check if subdirectory has any non-preservable files
-                        has_non_preserved_files = False
-                        for subitem in item.rglob('*'):
-                            if subitem.is_file() and not should_preserve_file(subitem):
-                                has_non_preserved_files = True
-                                break
-                        if has_non_preserved_files:
-                            has_content = True
-                            break
-            
-            if not has_content:
-                empty_dirs.append(root_path)
-        except OSError:
-            pass  # Directory might have been deleted already or is inaccessible
+        if not root_has_content and root != str(media_dir):
+            empty_dirs.append(Path(root))
     
     return empty_dirs
 
 
 def find_and_clean_empty_directories(media_dir: Path, dry_run: bool = False) -> int:
-    """Recursively find and clean empty directories after file deletion."""
+    """Remove empty directories after file deletion in a single bottom-up pass."""
     total_deleted = 0
-    max_iterations = 10  # Prevent infinite loops
-    iteration = 0
+    removed = set()
     
-    while iteration < max_iterations:
-        empty_dirs = []
-        
-        # Walk from bottom up to catch nested empty directories
-        for root, dirs, files in os.walk(media_dir, topdown=False):
-            root_path = Path(root)
-            
-            # Skip the root media directory itself
-            if root_path == media_dir:
-                continue
-                
-            # Check if directory is truly empty (no files, no subdirectories)
-            try:
-                dir_contents = list(root_path.iterdir())
-                if not dir_contents:
-                    empty_dirs.append(root_path)
-                else:
-                    # Check if directory only contains preserved files
-                    has_non_preserved_content = False
-                    for item in dir_contents:
-                        if item.is_file() and not should_preserve_file(item):
-                            has_non_preserved_content = True
-                            break
-                        elif item.is_dir():
-                            has_non_preserved_content = True
-                            break
-                    
-                    if not has_non_preserved_content:
-                        empty_dirs.append(root_path)
-            except OSError:
-                pass  # Directory might be inaccessible
-        
-        if not empty_dirs:
-            break  # No more empty directories found
-        
-        # Delete empty directories
-        deleted_this_iteration = 0
-        for dir_path in empty_dirs:
-            try:
-                if dry_run:
-                    print(f"[DRY RUN] Would remove empty directory: {dir_path}")
-                else:
-                    dir_path.rmdir()
-                    print(f"✅ Removed empty directory: {dir_path.name}")
-                deleted_this_iteration += 1
-            except OSError as e:
-                if not dry_run:
-                    print(f"❌ Failed to remove directory {dir_path}: {e}")
+    # Bottom-up: every subdirectory has been handled before its parent is checked
+    for root, dirs, files in os.walk(media_dir, topdown=False):
+        # Skip the root media directory itself
+        if root == str(media_dir):
+            continue
         
-        total_deleted += deleted_this_iteration
-        iteration += 1
+        # Subdirectories that survived (or would survive) this pass keep the parent
+        if any(os.path.join(root, name) not in removed for name in dirs):
+            continue
+        # Check if directory only contains preserved files
+        if any(name not in _PRESERVE_NAMES for name in files):
+            continue
         
-        if deleted_this_iteration == 0:
-            break  # No directories were deleted, so we're done
+        dir_path = Path(root)
+        try:
+            if dry_run:
+                print(f"[DRY RUN] Would remove empty directory: {dir_path}")
+            else:
+                dir_path.rmdir()
+                print(f"✅ Removed empty directory: {dir_path.name}")
+            total_deleted += 1
+            if not files:
+                removed.add(root)
+        except OSError as e:
+            if not dry_run:
+                print(f"❌ Failed to remove directory {dir_path}: {e}")
     
     return total_deleted
 
@@ -193,18 +184,12 @@ def format_file_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f} TB"
 
 
-def calculate_total_size(file_paths: List[Path]) -> int:
-    """Calculate total size of files to be deleted."""
-    total_size = 0
-    for file_path in file_paths:
-        try:
-            total_size += file_path.stat().st_size
-        except OSError:
-            pass  # File might not exist or be accessible
-    return total_size
+def calculate_total_size(files_to_clean: List[Tuple[Path, int]]) -> int:
+    """Calculate total size of files to be deleted from the sizes recorded during the walk."""
+    return sum(size for _, size in files_to_clean)
 
 
-def print_files_summary(files_to_clean: List[Path], media_dir: Path):
+def print_files_summary(files_to_clean: List[Tuple[Path, int]], media_dir: Path):
     """Print a summary of files to be cleaned."""
     if not files_to_clean:
         print("✅ No files found to clean!")
@@ -215,7 +200,7 @@ def print_files_summary(files_to_clean: List[Path], media_dir: Path):
     
     # Group files by directory
     dirs_with_files = {}
-    for file_path in files_to_clean:
+    for file_path, _ in files_to_clean:
         relative_dir = file_path.parent.relative_to(media_dir)
         if relative_dir not in dirs_with_files:
             dirs_with_files[relative_dir] = []
@@ -235,20 +220,89 @@ def print_files_summary(files_to_clean: List[Path], media_dir: Path):
     print(f"   📁 Directories affected: {len(dirs_with_files)}")
 
 
-def clean_files(files_to_clean: List[Path], dry_run: bool = False) -> int:
-    """Clean the specified files."""
+def _safe_unlink(file_path: Path) -> Optional[OSError]:
+    """Delete one file, returning the error instead of raising it."""
+    try:
+        os.unlink(file_path)
+    except OSError as e:
+        return e
+    return None
+
+
+def _owning_subtree(file_path: Path, subtree_set: Set[Path]) -> Optional[Path]:
+    """The whole-subtree directory containing file_path, if any."""
+    for parent in file_path.parents:
+        if parent in subtree_set:
+            return parent
+    return None
+
+
+def _subtree_holds_only(root: str, listed: Set[str]) -> bool:
+    """Whether every entry under root is a directory or one of the listed files."""
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _subtree_holds_only(entry.path, listed):
+                        return False
+                elif entry.path not in listed or not entry.is_file(follow_symlinks=False):
+                    return False
+    except OSError:
+        return False
+    return True
+
+
+def clean_files(files_to_clean: List[Tuple[Path, int]], dry_run: bool = False, jobs: int = _DEFAULT_JOBS,
+                subtrees: Optional[List[Path]] = None) -> int:
+    """
+    Clean the specified files, deleting up to `jobs` files concurrently. Directories in
+    subtrees held nothing but these files when scanned, so each one that still does is
+    removed with one rmtree; the files of any subtree that changed are unlinked one by one.
+    """
+    if dry_run:
+        for file_path, _ in files_to_clean:
+            print(f"[DRY RUN] Would delete: {file_path}")
+        return len(files_to_clean)
+    
     deleted_count = 0
+    errors = []
     
-    for file_path in files_to_clean:
+    # Split files into those removed with their whole directory and those unlinked one by one
+    subtree_set = set(subtrees or ())
+    subtree_files = {}
+    file_paths = []
+    for file_path, _ in files_to_clean:
+        subtree = _owning_subtree(file_path, subtree_set) if subtree_set else None
+        if subtree is None:
+            file_paths.append(file_path)
+        else:
+            subtree_files.setdefault(subtree, []).append(file_path)
+    
+    for subtree, listed_files in subtree_files.items():
+        # Files may have been added since the scan; never rmtree anything that wasn't listed
+        if not _subtree_holds_only(str(subtree), {str(file_path) for file_path in listed_files}):
+            file_paths.extend(listed_files)
+            continue
         try:
-            if dry_run:
-                print(f"[DRY RUN] Would delete: {file_path}")
-            else:
-                file_path.unlink()
-                print(f"✅ Deleted: {file_path.name}")
-            deleted_count += 1
+            shutil.rmtree(subtree)
         except OSError as e:
-            print(f"❌ Failed to delete {file_path}: {e}")
+            errors.append((subtree, e))
+            continue
+        deleted_count += len(listed_files)
+    
+    # unlink releases the GIL, so threads overlap the syscalls; progress is reported in batches
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for file_path, error in zip(file_paths, executor.map(_safe_unlink, file_paths)):
+            if error is not None:
+                errors.append((file_path, error))
+                continue
+            deleted_count += 1
+            if deleted_count % _DELETE_PROGRESS_EVERY == 0:
+                print(f"✅ Deleted {deleted_count}/{len(files_to_clean)} files...")
+    
+    print(f"✅ Deleted {deleted_count} files")
+    for file_path, e in errors:
+        print(f"❌ Failed to delete {file_path}: {e}")
     
     return deleted_count
 
@@ -317,6 +371,12 @@ Examples:
         action='store_true',
         help='Yes to all prompts. Deletes files without confirmation.'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=_DEFAULT_JOBS,
+        help=f'Number of files to delete concurrently (default: {_DEFAULT_JOBS})'
+    )
     
     args = parser.parse_args()
     
@@ -326,7 +386,8 @@ Examples:
     # Get paths and files
     media_dir = get_media_directory()
     extensions = get_file_extensions_to_clean()
-    files_to_clean = find_files_to_clean(media_dir, extensions)
+    deletable_subtrees = []
+    files_to_clean = find_files_to_clean(media_dir, extensions, deletable_subtrees)
     
     # Show summary
     print_files_summary(files_to_clean, media_dir)
@@ -377,7 +438,7 @@ Examples:
     
     # Clean files
     print(f"\n🗑️  Starting cleanup...")
-    deleted_files = clean_files(files_to_clean, dry_run=False)
+    deleted_files = clean_files(files_to_clean, dry_run=False, jobs=args.jobs, subtrees=deletable_subtrees)
     
     # Clean empty directories (using new recursive method)
     print(f"\n📁 Cleaning up empty directories...")
@@ -17,13 +17,34 @@ See: https://github.com/redis/redis-py
 
 import os
 import logging
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Optional
 
 import redis
-from redis import ConnectionPool, Redis
+from redis import BlockingConnectionPool, ConnectionPool, Redis
 
 logger = logging.getLogger(__name__)
 
+# Seconds a connection may sit idle before redis-py PINGs it on checkout
+HEALTH_CHECK_INTERVAL = 30
+# Seconds a successful health_check() result is reused without another PING
+HEALTH_CHECK_CACHE_TTL = 10
+
+
+@dataclass(frozen=True, slots=True)
+class RedisSettings:
+    """Immutable Redis connection settings parsed from the environment."""
+    host: str
+    port: int
+    db: int
+    password: Optional[str] = field(repr=False)
+    max_connections: int
+    socket_timeout: int
+    socket_connect_timeout: int
+    pool_timeout: int
+
 
 class RedisConfig:
     """Redis configuration with connection pooling and health checks."""
@@ -31,19 +52,38 @@ class RedisConfig:
     # Class-level connection pool and client (singleton pattern)
     _pool: Optional[ConnectionPool] = None
     _client: Optional[Redis] = None
+    # Parsed environment configuration, cached on first use
+    _config: Optional[RedisSettings] = None
+    # redis:// URL built from _config, cached alongside it
+    _conn_str: Optional[str] = None
+    # time.monotonic() of the last successful health check PING
+    _last_ping_ts: Optional[float] = None
+    # Guards lazy pool/client creation; reentrant because get_client builds the pool under it
+    _init_lock = threading.RLock()
+    
+    @classmethod
+    def get_config_from_env(cls) -> RedisSettings:
+        """Parse Redis configuration from environment variables (uncached; see get_config)."""
+        return RedisSettings(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', '6379')),
+            db=int(os.getenv('REDIS_DB', '0')),
+            password=os.getenv('REDIS_PASSWORD', None),
+            max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', '50')),
+            socket_timeout=int(os.getenv('REDIS_SOCKET_TIMEOUT', '5')),
+            socket_connect_timeout=int(os.getenv('REDIS_SOCKET_TIMEOUT', '5')),
+            pool_timeout=int(os.getenv('REDIS_POOL_TIMEOUT', '20')),
+        )
     
     @classmethod
-    def get_config_from_env(cls) -> dict:
-        """Get Redis configuration from environment variables."""
-        return {
-            'host': os.getenv('REDIS_HOST', 'localhost'),
-            'port': int(os.getenv('REDIS_PORT', '6379')),
-            'db': int(os.getenv('REDIS_DB', '0')),
-            'password': os.getenv('REDIS_PASSWORD', None),
-            'max_connections': int(os.getenv('REDIS_MAX_CONNECTIONS', '50')),
-            'socket_timeout': int(os.getenv('REDIS_SOCKET_TIMEOUT', '5')),
-            'socket_connect_timeout': int(os.getenv('REDIS_SOCKET_TIMEOUT', '5')),
-        }
+    def get_config(cls) -> RedisSettings:
+        """Get Redis configuration, parsing the environment only on the first call.
+        
+        Environment variables don't change after process start; close() clears the cache.
+        """
+        if cls._config is None:
+            cls._config = cls.get_config_from_env()
+        return cls._config
     
     @classmethod
     def is_enabled(cls) -> bool:
@@ -55,29 +95,40 @@ class RedisConfig:
         """Get or create Redis connection pool.
         
         Official redis-py pattern from docs:
-        pool = redis.ConnectionPool(host='localhost', port=6379, db=0)
+        pool = redis.BlockingConnectionPool(host='localhost', port=6379, db=0, timeout=20)
         """
-        if cls._pool is None:
-            config = cls.get_config_from_env()
-            
-            cls._pool = ConnectionPool(
-                host=config['host'],
-                port=config['port'],
-                db=config['db'],
-                password=config['password'],
-                max_connections=config['max_connections'],
-                socket_timeout=config['socket_timeout'],
-                socket_connect_timeout=config['socket_connect_timeout'],
-                decode_responses=True  # Return strings, not bytes
-            )
-            
-            logger.info(
-                f"[REDIS] 🔧 Connection pool initialized "
-                f"(host={config['host']}, port={config['port']}, "
-                f"max_connections={config['max_connections']})"
-            )
+        # Fast path: skip the lock once the pool exists
+        pool = cls._pool
+        if pool is not None:
+            return pool
         
-        return cls._pool
+        with cls._init_lock:
+            if cls._pool is None:
+                config = cls.get_config()
+                
+                # Blocking pool: once max_connections are checked out, callers wait up to
+                # pool_timeout for one to be released instead of failing immediately
+                cls._pool = BlockingConnectionPool(
+                    host=config.host,
+                    port=config.port,
+                    db=config.db,
+                    password=config.password,
+                    max_connections=config.max_connections,
+                    timeout=config.pool_timeout,
+                    socket_timeout=config.socket_timeout,
+                    socket_connect_timeout=config.socket_connect_timeout,
+                    # Re-validate idle connections on checkout instead of failing the next command
+                    health_check_interval=HEALTH_CHECK_INTERVAL,
+                    decode_responses=True  # Return strings, not bytes
+                )
+                
+                logger.info(
+                    f"[REDIS] 🔧 Connection pool initialized "
+                    f"(host={config.host}, port={config.port}, "
+                    f"max_connections={config.max_connections})"
+                )
+            
+            return cls._pool
     
     @classmethod
     def get_client(cls) -> Redis:
@@ -86,18 +137,26 @@ class RedisConfig:
         Official redis-py pattern from docs:
         r = redis.Redis(connection_pool=pool)
         """
-        if cls._client is None:
-            pool = cls.get_connection_pool()
-            cls._client = redis.Redis(connection_pool=pool)
-            logger.info("[REDIS] ✅ Redis client initialized")
+        # Fast path: skip the lock once the client exists
+        client = cls._client
+        if client is not None:
+            return client
         
-        return cls._client
+        with cls._init_lock:
+            if cls._client is None:
+                pool = cls.get_connection_pool()
+                cls._client = redis.Redis(connection_pool=pool)
+                logger.info("[REDIS] ✅ Redis client initialized")
+            
+            return cls._client
     
     @classmethod
     def health_check(cls) -> bool:
         """Perform Redis health check with ping.
         
         Official redis-py pattern: r.ping() returns True if connected.
+        A successful PING is reused for HEALTH_CHECK_CACHE_TTL seconds; failures are
+        never cached, so recovery is detected on the next call.
         
         Returns:
             bool: True if Redis is available and responding, False otherwise
@@ -106,10 +165,17 @@ class RedisConfig:
             logger.debug("[REDIS] Redis state management disabled")
             return False
         
+        last_ping_ts = cls._last_ping_ts
+        if (cls._client is not None and last_ping_ts is not None
+                and time.monotonic() - last_ping_ts < HEALTH_CHECK_CACHE_TTL):
+            return True
+        
+        cls._last_ping_ts = None
         try:
             client = cls.get_client()
             result = client.ping()
             if result:
+                cls._last_ping_ts = time.monotonic()
                 logger.debug("[REDIS] ✅ Health check passed")
             return result
         except redis.ConnectionError as e:
@@ -128,34 +194,46 @@ class RedisConfig:
         
         Format: redis://[password@]host:port/db
         """
-        config = cls.get_config_from_env()
+        conn_str = cls._conn_str
+        if conn_str is not None:
+            return conn_str
+        
+        config = cls.get_config()
         
-        if config['password']:
-            return (
-                f"redis://:{config['password']}@"
-                f"{config['host']}:{config['port']}/{config['db']}"
+        if config.password:
+            conn_str = (
+                f"redis://:{config.password}@"
+                f"{config.host}:{config.port}/{config.db}"
             )
         else:
-            return f"redis://{config['host']}:{config['port']}/{config['db']}"
+            conn_str = f"redis://{config.host}:{config.port}/{config.db}"
+        
+        cls._conn_str = conn_str
+        return conn_str
     
     @classmethod
     def close(cls):
         """Close Redis connections and cleanup resources."""
-        if cls._client is not None:
-            try:
-                cls._client.close()
-                logger.info("[REDIS] 🔌 Client connection closed")
-            except Exception as e:
-                logger.warning(f"[REDIS] Warning during client close: {e}")
-            finally:
-                cls._client = None
-        
-        if cls._pool is not None:
-            try:
-                cls._pool.disconnect()
-                logger.info("[REDIS] 🔌 Connection pool disconnected")
-            except Exception as e:
-                logger.warning(f"[REDIS] Warning during pool disconnect: {e}")
-            finally:
-                cls._pool = None
+        with cls._init_lock:
+            if cls._client is not None:
+                try:
+                    cls._client.close()
+                    logger.info("[REDIS] 🔌 Client connection closed")
+                except Exception as e:
+                    logger.warning(f"[REDIS] Warning during client close: {e}")
+                finally:
+                    cls._client = None
+            
+            if cls._pool is not None:
+                try:
+                    cls._pool.disconnect()
+                    logger.info("[REDIS] 🔌 Connection pool disconnected")
+                except Exception as e:
+                    logger.warning(f"[REDIS] Warning during pool disconnect: {e}")
+                finally:
+                    cls._pool = None
+            
+            cls._config = None
+            cls._conn_str = None
+            cls._last_ping_ts = None
 
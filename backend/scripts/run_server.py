@@ -40,7 +40,19 @@ def read_env_file():
     return env_vars
 
 def get_local_ip_addresses():
-    """Get all local IP addresses for this machine."""
+    """Get local IP addresses for this machine (just the primary outbound interface when routable)."""
+    # Connecting a UDP socket sends no packets and does no DNS lookup; it just makes the
+    # kernel pick the outbound interface, whose address getsockname() then reports
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            ip = s.getsockname()[0]
+        if not ip.startswith('127.'):
+            return [ip]
+    except OSError:
+        pass
+    
+    # No route out (e.g. offline): fall back to resolving the hostname, which may hit DNS
     ip_addresses = []
     try:
         # Get hostname
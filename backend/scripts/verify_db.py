@@ -111,14 +111,32 @@ def verify_models():
     print_section("MODEL VERIFICATION")
     
     try:
+        # Fetch every count in a single round trip instead of one COUNT query per model
+        qn = connection.ops.quote_name
+        user_table = qn(User._meta.db_table)
+        profile_table = qn(UserProfile._meta.db_table)
+        patient_table = qn(Patient._meta.db_table)
+        scan_table = qn(Scan._meta.db_table)
+        result_table = qn(ScanResult._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT (SELECT COUNT(*) FROM {user_table}), "
+                f"(SELECT COUNT(*) FROM {profile_table}), "
+                f"(SELECT COUNT(*) FROM {patient_table}), "
+                f"(SELECT COUNT(*) FROM {scan_table}), "
+                f"(SELECT COUNT(*) FROM {scan_table} WHERE {qn('is_processed')} = %s), "
+                f"(SELECT COUNT(*) FROM {result_table}), "
+                f"(SELECT COUNT({qn('scan_id')}) FROM {result_table})",
+                [True],
+            )
+            (user_count, profile_count, patient_count, scan_count,
+             processed_scan_count, result_count, scans_with_results) = cursor.fetchone()
+        
         # User and UserProfile counts
-        user_count = User.objects.count()
-        profile_count = UserProfile.objects.count()
         print(f"✅ Users: {user_count}")
         print(f"✅ User Profiles: {profile_count}")
         
         # Patient counts
-        patient_count = Patient.objects.count()
         print(f"✅ Patients: {patient_count}")
         
         if patient_count > 0:
@@ -129,16 +147,12 @@ def verify_models():
                 print(f"   No sample patient found")
         
         # Scan counts  
-        scan_count = Scan.objects.count()
-        processed_scan_count = Scan.objects.filter(is_processed=True).count()
         print(f"✅ Scans: {scan_count} (Processed: {processed_scan_count})")
         
         # ScanResult counts
-        result_count = ScanResult.objects.count()
         print(f"✅ Scan Results: {result_count}")
         
-        # Check for scans with results
-        scans_with_results = Scan.objects.filter(result__isnull=False).count()
+        # Check for scans with results (ScanResult.scan is a one-to-one, so each linked row is one scan)
         print(f"   Scans with results: {scans_with_results}")
         
     except Exception as e:
@@ -7,28 +7,40 @@ Purpose: Run all test scripts in the test directory
 Usage:
     cd backend/test
     python run_all_tests.py
+    python run_all_tests.py --jobs 4    # Run scripts concurrently
 """
 
 import os
 import sys
+import argparse
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def run_test_script(script_name):
+def run_test_script(script_name, capture_output=False):
     """Run a single test script and capture results"""
-    print(f"\n{'='*80}")
-    print(f"RUNNING: {script_name}")
-    print(f"{'='*80}")
+    if not capture_output:
+        print(f"\n{'='*80}")
+        print(f"RUNNING: {script_name}")
+        print(f"{'='*80}")
     
     try:
         # Run the script
         result = subprocess.run(
             [sys.executable, script_name],
             cwd=Path(__file__).parent,
-            capture_output=False,
+            capture_output=capture_output,
             text=True
         )
         
+        if capture_output:
+            # Print the script's output as one block so concurrent runs don't interleave
+            print(f"\n{'='*80}")
+            print(f"RAN: {script_name}")
+            print(f"{'='*80}")
+            print(result.stdout, end='')
+            print(result.stderr, end='', file=sys.stderr)
+        
         if result.returncode == 0:
             print(f"✅ {script_name} completed successfully")
             return True
@@ -42,6 +54,16 @@ def run_test_script(script_name):
 
 def main():
     """Run all test scripts"""
+    parser = argparse.ArgumentParser(description="Run all HydroFast test scripts")
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of scripts to run concurrently (default: 1). Several scripts share '
+             'media/temp, so only raise this when they are not cleaning up the same sessions'
+    )
+    args = parser.parse_args()
+    
     print("HydroFast Test Suite Runner")
     print("="*80)
     
@@ -72,10 +94,22 @@ def main():
     for script in existing_scripts:
         print(f"  📄 {script}")
     
-    # Run tests
+    # Run tests; each script is its own subprocess, so threads are enough to overlap them
     results = {}
-    for script in existing_scripts:
-        results[script] = run_test_script(script)
+    jobs = max(1, min(args.jobs, len(existing_scripts) or 1))
+    if jobs == 1:
+        for script in existing_scripts:
+            results[script] = run_test_script(script)
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                executor.submit(run_test_script, script, True): script
+                for script in existing_scripts
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        # Report in the listed order rather than completion order
+        results = {script: results[script] for script in existing_scripts}
     
     # Summary
     print(f"\n{'='*80}")
@@ -0,0 +1,64 @@
+import { scanService } from '../../services/scanService';
+import api from '../../services/api';
+
+// Mock the api service
+jest.mock('../../services/api', () => ({
+  post: jest.fn(),
+  get: jest.fn(),
+}));
+
+describe('scanService', () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+  });
+
+  describe('getPatientScans', () => {
+    it('should follow next links until every page is fetched', async () => {
+      api.get
+        .mockResolvedValueOnce({
+          data: {
+            count: 3,
+            next: 'http://127.0.0.1:8000/api/scans/?limit=2&offset=2&patient=7',
+            previous: null,
+            results: [{ id: 3 }, { id: 2 }],
+          },
+        })
+        .mockResolvedValueOnce({
+          data: {
+            count: 3,
+            next: null,
+            previous: 'http://127.0.0.1:8000/api/scans/?limit=2&patient=7',
+            results: [{ id: 1 }],
+          },
+        });
+
+      const result = await scanService.getPatientScans(7);
+
+      expect(api.get).toHaveBeenNthCalledWith(1, '/scans/?patient=7');
+      expect(api.get).toHaveBeenNthCalledWith(2, 'http://127.0.0.1:8000/api/scans/?limit=2&offset=2&patient=7');
+      expect(result).toEqual([{ id: 3 }, { id: 2 }, { id: 1 }]);
+    });
+
+    it('should accept an unpaginated list response', async () => {
+      api.get.mockResolvedValue({ data: [{ id: 1 }] });
+
+      const result = await scanService.getPatientScans(7);
+
+      expect(api.get).toHaveBeenCalledTimes(1);
+      expect(result).toEqual([{ id: 1 }]);
+    });
+  });
+
+  describe('getScans', () => {
+    it('should return all pages for filtered queries', async () => {
+      api.get
+        .mockResolvedValueOnce({ data: { next: '/scans/?offset=1&patient=2', results: [{ id: 2 }] } })
+        .mockResolvedValueOnce({ data: { next: null, results: [{ id: 1 }] } });
+
+      const result = await scanService.getScans({ patient: 2 });
+
+      expect(api.get).toHaveBeenNthCalledWith(1, '/scans/?patient=2');
+      expect(result).toEqual([{ id: 2 }, { id: 1 }]);
+    });
+  });
+});
@@ -1,9 +1,25 @@
 import api from './api';
 
+// Scan lists are paginated ({ count, next, previous, results }); follow `next` until
+// it is null so callers always get the complete list
+const getAllPages = async (url) => {
+  const results = [];
+  let nextUrl = url;
+  while (nextUrl) {
+    const response = await api.get(nextUrl);
+    const { data } = response;
+    if (Array.isArray(data)) {
+      return results.concat(data);
+    }
+    results.push(...data.results);
+    nextUrl = data.next;
+  }
+  return results;
+};
+
 const getAllScans = async () => {
   try {
-    const response = await api.get('/scans/');
-    return response.data;
+    return await getAllPages('/scans/');
   } catch (error) {
     console.error('Error fetching scans:', error);
     throw error;
@@ -14,8 +30,7 @@ const getScans = async (params = {}) => {
   try {
     const queryParams = new URLSearchParams(params).toString();
     const url = queryParams ? `/scans/?${queryParams}` : '/scans/';
-    const response = await api.get(url);
-    return response.data;
+    return await getAllPages(url);
   } catch (error) {
     console.error('Error fetching scans:', error);
     throw error;
@@ -24,8 +39,7 @@ const getScans = async (params = {}) => {
 
 const getPatientScans = async (patientId) => {
   try {
-    const response = await api.get(`/scans/?patient=${patientId}`);
-    return response.data;
+    return await getAllPages(`/scans/?patient=${patientId}`);
   } catch (error) {
     console.error('Error fetching patient scans:', error);
     throw error;